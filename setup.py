@@ -3,7 +3,6 @@ import os
 import sys
 import shutil
 import zipfile
-import tempfile
 
 import yaml
 
@@ -37,55 +36,73 @@ def setup_config():
         print(f"FATAL: An error occurred while creating the config file: {e}")
         sys.exit(1)
 
-def create_directories():
+def load_project_paths() -> dict:
     """
-    Creates the directory structure specified in config.yaml.
+    Loads config.yaml and returns its fully resolved 'project_paths' section,
+    or an empty dict if the section is missing. Resolved once in main() and
+    shared by the setup steps that need it.
     """
-    print("\nCreating data directories...")
     try:
         config = load_yaml_config(CONFIG_PATH)
+    except FileNotFoundError:
+        print(f"FATAL: {CONFIG_PATH} not found. Run setup without flags first.")
+        sys.exit(1)
+    except yaml.YAMLError:
+        print(f"FATAL: Could not parse {CONFIG_PATH}. Please ensure it is valid YAML.")
+        sys.exit(1)
 
-        # --- Robust Placeholder Resolution ---
-        project_paths = config.get('project_paths', {})
-        if not project_paths:
-            print("WARNING: No 'project_paths' found in config.yaml. Cannot create directories.")
-            return
+    project_paths = config.get('project_paths', {})
+    if not project_paths:
+        return {}
+    return resolve_project_paths(PROJECT_ROOT, project_paths)
 
-        templates = resolve_project_paths(PROJECT_ROOT, project_paths)
+def create_directories(project_paths: dict):
+    """
+    Creates the directory structure specified in config.yaml.
+    """
+    print("\nCreating data directories...")
+    if not project_paths:
+        print("WARNING: No 'project_paths' found in config.yaml. Cannot create directories.")
+        return
 
+    try:
         # --- Directory Creation ---
-        for key, path in templates.items():
+        dirs_to_create = set()
+        for key, path in project_paths.items():
             if key == 'project_root':
                 continue
 
             path = os.path.normpath(path)
 
             if os.path.splitext(path)[1]:
-                dir_to_create = os.path.dirname(path)
+                dirs_to_create.add(os.path.dirname(path))
             else:
-                dir_to_create = path
-            
-            if not os.path.exists(dir_to_create):
-                os.makedirs(dir_to_create, exist_ok=True)
+                dirs_to_create.add(path)
+
+        # After sorting, a directory is immediately followed by its descendants, so
+        # any entry that is a prefix of the next one is created implicitly by it.
+        sorted_dirs = sorted(dirs_to_create)
+        leaf_dirs = [
+            d for i, d in enumerate(sorted_dirs)
+            if i + 1 == len(sorted_dirs) or not sorted_dirs[i + 1].startswith(d.rstrip(os.sep) + os.sep)
+        ]
+
+        for dir_to_create in leaf_dirs:
+            try:
+                os.makedirs(dir_to_create)
                 print(f"  - Created: {dir_to_create}")
-            else:
+            except FileExistsError:
                 print(f"  - Exists:  {dir_to_create}")
         print("Directory setup complete.")
 
-    except FileNotFoundError:
-        print(f"FATAL: {CONFIG_PATH} not found. Run setup without flags first.")
-        sys.exit(1)
-    except yaml.YAMLError:
-        print(f"FATAL: Could not parse {CONFIG_PATH}. Please ensure it is valid YAML.")
-        sys.exit(1)
     except Exception as e:
         print(f"FATAL: An error occurred during directory creation: {e}")
         sys.exit(1)
 
-def install_test_data():
+def install_test_data(project_paths: dict):
     """
-    Installs test data from a zip archive by extracting to a temp directory
-    and merging the contents into the correct final destinations.
+    Installs test data from a zip archive by streaming the 'input' and 'cache'
+    members directly into their configured final destinations.
     """
     print("\nAttempting to install test data...")
     
@@ -98,41 +115,53 @@ def install_test_data():
         return
 
     try:
-        config = load_yaml_config(CONFIG_PATH)
-
         # --- Resolve Destination Paths ---
-        templates = resolve_project_paths(PROJECT_ROOT, config.get('project_paths', {}))
-
-        final_input_dest = os.path.normpath(templates.get('input_folder', ''))
-        final_cache_dest = os.path.normpath(templates.get('cache_folder', ''))
+        final_input_dest = project_paths.get('input_folder')
+        final_cache_dest = project_paths.get('cache_folder')
 
         if not all([final_input_dest, final_cache_dest]):
             raise KeyError("Could not resolve 'input_folder' or 'cache_folder' from config.")
 
-        # --- Extraction and Merging ---
-        with tempfile.TemporaryDirectory() as temp_dir:
-            print(f"Extracting archive to temporary location...")
-            with zipfile.ZipFile(TEST_DATA_ARCHIVE, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-
-            # Define source directories from the extracted archive
-            temp_input_src = os.path.join(temp_dir, 'input')
-            temp_cache_src = os.path.join(temp_dir, 'cache')
-
-            # Move/merge the contents
-            if os.path.isdir(temp_input_src):
-                print(f"Merging test 'input' data into {final_input_dest}...")
-                shutil.copytree(temp_input_src, final_input_dest, dirs_exist_ok=True)
+        final_input_dest = os.path.normpath(final_input_dest)
+        final_cache_dest = os.path.normpath(final_cache_dest)
 
-            if os.path.isdir(temp_cache_src):
-                print(f"Merging test 'cache' data into {final_cache_dest}...")
-                shutil.copytree(temp_cache_src, final_cache_dest, dirs_exist_ok=True)
-
-            print("Test data successfully installed.")
+        # --- Extraction and Merging ---
+        # Each archive member is streamed straight to its final destination,
+        # so every byte is written once and no temporary copy is needed.
+        destinations = {'input': final_input_dest, 'cache': final_cache_dest}
+        print("Extracting archive into data folders...")
+        with zipfile.ZipFile(TEST_DATA_ARCHIVE, 'r') as zip_ref:
+            # Map members to targets first so each unique directory is created once,
+            # rather than once per file.
+            files_to_extract = []
+            dirs_to_create = set()
+            for member in zip_ref.infolist():
+                top_level, _, relative_path = member.filename.partition('/')
+                dest_root = destinations.get(top_level)
+                if dest_root is None or not relative_path:
+                    continue
+
+                target_path = os.path.normpath(os.path.join(dest_root, relative_path))
+                # Guard against members that would escape the destination ("zip slip").
+                if os.path.commonpath([dest_root, target_path]) != dest_root:
+                    print(f"  - Skipping unsafe archive member: {member.filename}")
+                    continue
+
+                if member.is_dir():
+                    dirs_to_create.add(target_path)
+                else:
+                    dirs_to_create.add(os.path.dirname(target_path))
+                    files_to_extract.append((member, target_path))
+
+            for dir_path in dirs_to_create:
+                os.makedirs(dir_path, exist_ok=True)
+
+            for member, target_path in files_to_extract:
+                with zip_ref.open(member) as src, open(target_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+
+        print("Test data successfully installed.")
 
-    except FileNotFoundError:
-         print(f"FATAL: Could not find {CONFIG_PATH} or one of its parent directories.")
-         sys.exit(1)
     except KeyError as e:
         print(f"FATAL: {e}")
         sys.exit(1)
@@ -151,13 +180,14 @@ def main():
     
     # Core setup tasks
     setup_config()
-    create_directories()
+    project_paths = load_project_paths()
+    create_directories(project_paths)
 
     # Always ask about test data
     try:
         response = input("\nDo you want to install the test data? (y/n): ").lower()
         if response == 'y':
-            install_test_data()
+            install_test_data(project_paths)
         else:
             print("Skipping test data installation.")
     except (KeyboardInterrupt, EOFError):
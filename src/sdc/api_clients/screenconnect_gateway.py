@@ -1,6 +1,13 @@
+import sys
+from itertools import repeat
+
+import orjson
 import requests
 from typing import List, Dict, Any
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from sdc.utils.constants import SCREENCONNECT_DEFAULT_API_LIMIT, SCREENCONNECT_QUERY_FIELDS
 
 class ScreenConnectGateway:
@@ -21,6 +28,29 @@ class ScreenConnectGateway:
             'Ctrlauthheader': api_key
         }
 
+        # A pooled session reuses the TCP/TLS connection across calls and retries
+        # transient throttling/server errors instead of failing the whole fetch.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retry_policy = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET']
+        )
+        adapter = HTTPAdapter(pool_maxsize=4, max_retries=retry_policy)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Every field of the GetReport payload except FilterExpression is constant,
+        # so encode it once here; each call only serializes the filter string.
+        self._payload_prefix = (
+            b'[{"ReportType":"SessionConnection","SelectFieldNames":'
+            + orjson.dumps(SCREENCONNECT_QUERY_FIELDS)
+            + b',"ItemLimit":' + str(SCREENCONNECT_DEFAULT_API_LIMIT).encode()
+            + b',"FilterExpression":'
+        )
+
     def fetch_connections(self, filter_expression: str) -> List[Dict[str, Any]]:
         """
         Fetches connection data from the ScreenConnect API based on a filter expression.
@@ -28,21 +58,14 @@ class ScreenConnectGateway:
         :param filter_expression: The filter to apply to the query.
         :return: A list of dictionaries, where each dictionary represents a connection.
         """
-        payload = [
-            {
-                "ReportType": "SessionConnection",
-                "SelectFieldNames": SCREENCONNECT_QUERY_FIELDS,
-                "FilterExpression": filter_expression,
-                "ItemLimit": SCREENCONNECT_DEFAULT_API_LIMIT
-            }
-        ]
+        payload = self._payload_prefix + orjson.dumps(filter_expression) + b'}]'
 
         try:
             # The API uses a GET request but expects a JSON body
-            response = requests.get(self.url, headers=self.headers, json=payload)
+            response = self.session.get(self.url, data=payload, timeout=30)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             
             field_names = data.get('FieldNames')
             items = data.get('Items')
@@ -51,7 +74,10 @@ class ScreenConnectGateway:
                 print("Warning: API response did not contain 'FieldNames' or 'Items'.")
                 return []
 
-            return [dict(zip(field_names, item)) for item in items]
+            # Intern the column names once so every row dict shares the same key
+            # objects, and let map/zip build the rows without a Python-level loop.
+            field_names = tuple(map(sys.intern, field_names))
+            return list(map(dict, map(zip, repeat(field_names), items)))
 
         except requests.exceptions.RequestException as e:
             print(f"Error fetching data from ScreenConnect API: {e}")
@@ -2,10 +2,34 @@
 """A gateway class for all interactions with the Syncro API."""
 
 import requests
+import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any
 
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+MAX_CONCURRENT_PAGE_REQUESTS = 5
+MIN_REQUEST_INTERVAL_SECONDS = 0.2  # At most 5 requests/second. Be a good API citizen.
+
+class _RateLimiter:
+    """Thread-safe limiter that spaces request starts at least `interval` seconds apart."""
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 class SyncroGateway:
     """Centralizes all Syncro API interaction logic."""
     def __init__(self, config: Dict, logger):
@@ -18,53 +42,95 @@ class SyncroGateway:
             self.logger.error(f"SyncroGateway init failed: Missing key {e} in syncro_api config.")
             raise  # Re-raise the exception to stop execution if config is bad
 
+        # A single pooled session keeps the TCP/TLS connection alive across
+        # paginated requests instead of re-handshaking for every page.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        retry_policy = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_maxsize=8, max_retries=retry_policy)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._rate_limiter = _RateLimiter(MIN_REQUEST_INTERVAL_SECONDS)
+
+    def _fetch_page(self, endpoint_url: str, params: Optional[Dict[str, Any]], page: int) -> Dict[str, Any]:
+        """Fetches and decodes a single page, waiting for a rate-limit slot first."""
+        request_params = params.copy() if params else {}
+        request_params['page'] = page
+        self._rate_limiter.wait()
+        response = self.session.get(endpoint_url, params=request_params, timeout=30)
+        response.raise_for_status()
+        # orjson parses the raw bytes directly, skipping requests' text decode.
+        return orjson.loads(response.content)
+
     def _fetch_paginated_data(self, endpoint_url: str, params: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
-        """Fetches all items from a paginated Syncro API endpoint."""
+        """
+        Fetches all items from a paginated Syncro API endpoint.
+
+        Page 1 is fetched on its own to learn `meta.total_pages`; the remaining
+        pages are then fetched concurrently (rate limited) and reassembled in
+        page order.
+        """
         all_items = []
         data_key = endpoint_url.split('/')[-1].split('?')[0]
         page = 1
-        max_pages = 100  # Safety limit
 
         self.logger.info(f"Starting to fetch all {data_key} from {endpoint_url} with params: {params}")
 
-        while page <= max_pages:
-            request_params = params.copy() if params else {}
-            request_params['page'] = page
-            try:
-                response = requests.get(endpoint_url, headers=self.headers, params=request_params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-
-                if data_key in data and data[data_key]:
-                    items_on_page = data[data_key]
-                    all_items.extend(items_on_page)
-                    self.logger.debug(f"Fetched page {page} for {data_key}, {len(items_on_page)} items. Total so far: {len(all_items)}.")
-                else:
-                    self.logger.info(f"No more {data_key} found on page {page}. Concluding fetch.")
-                    break
+        try:
+            data = self._fetch_page(endpoint_url, params, page)
 
-                if 'meta' in data and data['meta'].get('total_pages'):
-                    total_pages = data['meta']['total_pages']
-                    if page >= total_pages:
-                        self.logger.info(f"Reached the last page ({page}/{total_pages}) for {data_key}.")
-                        break
-                    # Update max_pages to the actual total if available
-                    max_pages = total_pages
-                else:
-                    # This handles cases where the API doesn't return pagination meta,
-                    # which can happen for single-page results.
-                    self.logger.warning(f"Pagination 'meta' data not found for {data_key}. Assuming single page and stopping.")
-                    break
+            if not (data_key in data and data[data_key]):
+                self.logger.info(f"No more {data_key} found on page {page}. Concluding fetch.")
+                self.logger.info(f"Finished fetching {data_key}. Total retrieved: 0")
+                return all_items
+
+            all_items.extend(data[data_key])
+            self.logger.debug(f"Fetched page {page} for {data_key}, {len(data[data_key])} items. Total so far: {len(all_items)}.")
 
-                page += 1
-                time.sleep(0.2)  # Be a good API citizen
+            if not ('meta' in data and data['meta'].get('total_pages')):
+                # This handles cases where the API doesn't return pagination meta,
+                # which can happen for single-page results.
+                self.logger.warning(f"Pagination 'meta' data not found for {data_key}. Assuming single page and stopping.")
+                self.logger.info(f"Finished fetching {data_key}. Total retrieved: {len(all_items)}")
+                return all_items
+
+            total_pages = data['meta']['total_pages']
+            remaining_pages = range(2, total_pages + 1)
+            pages_data: Dict[int, Dict[str, Any]] = {}
+            if remaining_pages:
+                self.logger.info(f"Fetching pages 2-{total_pages} for {data_key} concurrently.")
+                with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGE_REQUESTS) as executor:
+                    futures = {
+                        executor.submit(self._fetch_page, endpoint_url, params, p): p
+                        for p in remaining_pages
+                    }
+                    for future in as_completed(futures):
+                        page = futures[future]
+                        try:
+                            pages_data[page] = future.result()
+                        except Exception:
+                            # Don't keep hitting the API for pages we will discard.
+                            for pending in futures:
+                                pending.cancel()
+                            raise
+
+            for page in remaining_pages:
+                items_on_page = pages_data[page].get(data_key)
+                if not items_on_page:
+                    self.logger.info(f"No more {data_key} found on page {page}. Concluding fetch.")
+                    break
+                all_items.extend(items_on_page)
+                self.logger.debug(f"Fetched page {page} for {data_key}, {len(items_on_page)} items. Total so far: {len(all_items)}.")
+            else:
+                self.logger.info(f"Reached the last page ({total_pages}/{total_pages}) for {data_key}.")
 
-            except requests.exceptions.RequestException as e:
-                self.logger.error(f"API request failed while fetching {data_key} page {page}: {e}")
-                return None
-            except json.JSONDecodeError as e:
-                self.logger.error(f"Error decoding JSON from page {page} for {data_key}: {e}")
-                return None  # Stop processing on bad JSON
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"API request failed while fetching {data_key} page {page}: {e}")
+            return None
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Error decoding JSON from page {page} for {data_key}: {e}")
+            return None  # Stop processing on bad JSON
 
         self.logger.info(f"Finished fetching {data_key}. Total retrieved: {len(all_items)}")
         return all_items
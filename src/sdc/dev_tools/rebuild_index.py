@@ -5,8 +5,7 @@ A developer tool to rebuild the entire SQLite index from session files.
 
 import os
 import sys
-import glob
-import logging
+import multiprocessing
 
 # --- Setup sys.path to find the 'sdc' module ---
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,6 +24,27 @@ except ImportError as e:
     print(f"Error: {e}")
     sys.exit(1)
 
+COMMIT_BATCH_SIZE = 1000
+PARSE_CHUNK_SIZE = 32
+
+_worker_logger = None
+
+def _init_load_worker(config):
+    """
+    Process-pool initializer: configures the sdc logger once per worker, so
+    load errors reach sdc.log under the spawn start method as well as fork.
+    """
+    global _worker_logger
+    _worker_logger = get_sdc_logger(__name__, config)
+
+def _load_session_worker(file_path: str):
+    """
+    Process-pool worker: parses and validates one session file.
+    Returns (file_path, Session or None); load_session_from_file logs and
+    swallows its own errors, so this never raises for a bad file.
+    """
+    return file_path, load_session_from_file(file_path, _worker_logger)
+
 def main():
     """Main execution function to rebuild the index."""
     
@@ -46,28 +66,47 @@ def main():
 
     # 2. Init SessionDatabaseManager
     logger.info(f"Initializing database manager for: {db_path}")
-    manager = SessionDatabaseManager(db_path, logger)
+    manager = SessionDatabaseManager(db_path, logger, bulk_load=True)
 
     # 3. Run manager.init_schema()
     logger.info("Initializing database schema...")
     manager.init_schema()
 
     # 4. Traverse sessions_output_folder
-    session_files = glob.glob(os.path.join(sessions_folder, '*.json'))
-    total_files = len(session_files)
+    # DirEntry.is_file() uses the d_type from readdir, so no extra stat per file.
+    try:
+        with os.scandir(sessions_folder) as it:
+            session_entries = [
+                entry for entry in it
+                if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
+        logger.warning(f"Sessions folder not found: '{sessions_folder}'. Nothing to index.")
+        session_entries = []
+    total_files = len(session_entries)
     logger.info(f"Found {total_files} session files to process in '{sessions_folder}'.")
 
-    # 5. For each .json file, load and upsert
-    for i, file_path in enumerate(session_files):
-        try:
-            logger.info(f"Processing file {i+1}/{total_files}: {os.path.basename(file_path)}")
-            session = load_session_from_file(file_path, logger)
-            if session:
-                manager.upsert_session(session)
-            else:
-                logger.warning(f"Could not load session from file: {file_path}")
-        except Exception as e:
-            logger.error(f"Failed to process file {file_path}: {e}", exc_info=True)
+    # 5. Parse the .json files across a process pool and upsert the results from
+    # this process only (the SQLite connection is the single writer). Upserts are
+    # batched into one transaction per COMMIT_BATCH_SIZE files.
+    file_paths = [entry.path for entry in session_entries]
+    manager.conn.execute('BEGIN')
+    with multiprocessing.Pool(initializer=_init_load_worker, initargs=(config,)) as pool:
+        parsed = pool.imap_unordered(_load_session_worker, file_paths, chunksize=PARSE_CHUNK_SIZE)
+        for i, (file_path, session) in enumerate(parsed):
+            try:
+                logger.info(f"Processing file {i+1}/{total_files}: {os.path.basename(file_path)}")
+                if session:
+                    manager.upsert_session(session, commit=False)
+                else:
+                    logger.warning(f"Could not load session from file: {file_path}")
+            except Exception as e:
+                logger.error(f"Failed to process file {file_path}: {e}", exc_info=True)
+
+            if (i + 1) % COMMIT_BATCH_SIZE == 0:
+                manager.conn.commit()
+                manager.conn.execute('BEGIN')
+    manager.conn.commit()
 
     logger.info("--- Index rebuild complete. Running verification query. ---")
 
@@ -75,8 +114,9 @@ def main():
     try:
         # Test: Count segments where metadata indicates it's a user message.
         # This is a simple but effective way to verify that the metadata column is being populated.
+        # is_user is an indexed column generated from metadata, so this is an index-only count.
         cursor = manager.conn.execute("""
-            SELECT COUNT(*) FROM segments WHERE metadata LIKE '%"is_user": true%'
+            SELECT COUNT(*) FROM segments WHERE is_user = 1
         """)
         # fetchone() will return a tuple like (count,)
         result = cursor.fetchone()
@@ -1,24 +1,44 @@
 # -*- coding: utf-8 -*-
 """Ingestor for data from the legacy notes.json file format."""
 
+import datetime
 import json
+import multiprocessing
 import os
-import uuid
-from typing import Any, Dict
+from itertools import chain, islice
+from typing import Any, Dict, Iterator, Optional
+
+import orjson
+
+# ijson is optional: with it, notes.json is streamed record by record instead of
+# being loaded whole. Without it we fall back to a single orjson parse.
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # --- V2 IMPORTS ---
 # Import the new Session models and the new session handler
 from sdc.models.session_v2 import Session, SessionSegment, SessionMeta, SessionContext, SessionInsights
-from sdc.utils.session_handler import save_session_to_file
+from sdc.utils.session_handler import save_session_to_file, save_sessions_to_files
 # --- SHARED UTILS ---
 from sdc.utils import file_ingestor_state_handler as state_handler
 from sdc.utils.date_utils import parse_datetime_utc
-from sdc.utils.session_builder import build_session
+from sdc.utils.session_builder import build_session, new_uuid4_str
 from sdc.utils.sdc_logger import get_sdc_logger
 from sdc.utils.constants import UNDEFINED_TIMESTAMP
 
 # --- CONSTANTS ---
 STATE_FILE_NAME = 'notes_json_ingestor_state.json'
+# Sessions are written in batches of this size so file I/O overlaps on a thread pool.
+SAVE_BATCH_SIZE = 256
+# Files with at least this many tickets are transformed on a process pool; below it,
+# worker start-up costs more than it saves.
+PARALLEL_TICKET_THRESHOLD = 500
+# Tickets are handed to the pool in windows of this size so a streamed file is
+# never fully materialized in the task queue.
+PARALLEL_TICKET_WINDOW = 4096
+PARALLEL_TICKET_CHUNK_SIZE = 32
 
 # =================================================================================
 #  HELPER FUNCTIONS - PURE LOGIC
@@ -29,53 +49,58 @@ def _transform_ticket_to_session(
     index: int,
     notes_file_path: str,
     config: Dict[str, Any],
-    logger
+    logger,
+    ingestion_time: Optional[datetime.datetime] = None
 ) -> Session:
     """Transforms a single ticket dictionary into a V2 Session object."""
+    # Fields reused across every segment are read once up front.
+    get = ticket.get
+    contact = get('contact')
     segments = []
-    raw_ticket_date = ticket.get('date')
+    raw_ticket_date = get('date')
     ticket_creation_time = parse_datetime_utc(raw_ticket_date, config)
     if not ticket_creation_time:
         logger.warning(
-            f"Ticket {ticket.get('ticketNumber', 'N/A')} has missing/invalid date ('{raw_ticket_date}'). "
+            f"Ticket {get('ticketNumber', 'N/A')} has missing/invalid date ('{raw_ticket_date}'). "
             f"Using placeholder timestamp: {UNDEFINED_TIMESTAMP.isoformat()}"
         )
         ticket_creation_time = UNDEFINED_TIMESTAMP
 
     # Create a segment for the initial issue description
-    if ticket.get('initial_issue'):
+    initial_issue = get('initial_issue')
+    if initial_issue:
         segments.append(SessionSegment(
-            segment_id=str(uuid.uuid4()),
+            segment_id=new_uuid4_str(),
             start_time_utc=ticket_creation_time,
             end_time_utc=ticket_creation_time,
             type="TicketInitialIssue",
-            author=ticket.get('contact'),
-            content=ticket.get('initial_issue'),
+            author=contact,
+            content=initial_issue,
             metadata={}
         ))
 
-    # Create segments for each sub-note
-    for sub_note in ticket.get('notes', []):
+    # Create segments for each sub-note within the ticket
+    for sub_note in get('notes', []):
         note_time = parse_datetime_utc(sub_note.get('date'), config) or ticket_creation_time
         segments.append(SessionSegment(
-            segment_id=str(uuid.uuid4()),
+            segment_id=new_uuid4_str(),
             start_time_utc=note_time,
             end_time_utc=note_time,
             type="TicketNote",
-            author=sub_note.get('user', ticket.get('contact')),
+            author=sub_note.get('user', contact),
             content=sub_note.get('note'),
             metadata={'order': sub_note.get('order')}
         ))
-    
+
     # Create segments for each to-do item within the ticket
-    for sub_todo in ticket.get('to-do', []):
+    for sub_todo in get('to-do', []):
         todo_time = parse_datetime_utc(sub_todo.get('date'), config) or ticket_creation_time
         segments.append(SessionSegment(
-            segment_id=str(uuid.uuid4()),
+            segment_id=new_uuid4_str(),
             start_time_utc=todo_time,
             end_time_utc=todo_time,
             type="TicketToDo",
-            author=sub_todo.get('user', ticket.get('contact')),
+            author=sub_todo.get('user', contact),
             content=f"To-Do: {sub_todo.get('task')}",
             metadata={'order': sub_todo.get('order'), 'completed': sub_todo.get('completed')}
         ))
@@ -84,9 +109,10 @@ def _transform_ticket_to_session(
         segments=segments,
         source_system="notes.json",
         source_identifiers=[notes_file_path, f"/tickets/{index}"],
-        customer_name=ticket.get('customer'),
-        contact_name=ticket.get('contact'),
-        source_title=ticket.get('subject')
+        customer_name=get('customer'),
+        contact_name=contact,
+        source_title=get('subject'),
+        ingestion_time=ingestion_time
         # processing_status defaults to "Needs Linking", which is correct here
     )
 
@@ -95,28 +121,78 @@ def _transform_todo_to_session(
     index: int,
     notes_file_path: str,
     config: Dict[str, Any],
-    logger
+    logger,
+    ingestion_time: Optional[datetime.datetime] = None
 ) -> Session:
     """Transforms a single standalone ToDo dictionary into a V2 Session object."""
-    raw_todo_date = todo.get('date')
-    todo_creation_time = parse_datetime_utc(raw_todo_date, config) or UNDEFINED_TIMESTAMP
+    get = todo.get
+    contact = get('contact')
+    todo_creation_time = parse_datetime_utc(get('date'), config) or UNDEFINED_TIMESTAMP
     
     segments = [SessionSegment(
-        segment_id=str(uuid.uuid4()), start_time_utc=todo_creation_time, end_time_utc=todo_creation_time,
-        type="StandaloneToDo", author=todo.get('contact'), content=todo.get('task'),
-        metadata={'completed': todo.get('completed')}
+        segment_id=new_uuid4_str(), start_time_utc=todo_creation_time, end_time_utc=todo_creation_time,
+        type="StandaloneToDo", author=contact, content=get('task'),
+        metadata={'completed': get('completed')}
     )]
 
     return build_session(
         segments=segments,
         source_system="notes.json",
         source_identifiers=[notes_file_path, f"/toDoItems/{index}"],
-        customer_name=todo.get('customer'),
-        contact_name=todo.get('contact'),
-        source_title=todo.get('subject')
+        customer_name=get('customer'),
+        contact_name=contact,
+        source_title=get('subject'),
+        ingestion_time=ingestion_time
         # processing_status defaults to "Needs Linking", which is correct here
     )
 
+def _process_ticket(
+    ticket: Dict[str, Any],
+    index: int,
+    notes_file_path: str,
+    config: Dict[str, Any],
+    logger,
+    ingestion_time: Optional[datetime.datetime] = None
+) -> Optional[Session]:
+    """Transforms one ticket, returning None (after logging why) if it is skipped or fails."""
+    try:
+        if not ticket.get('ticketNumber'):
+            logger.warning("Skipping ticket with no ticketNumber.")
+            return None
+        return _transform_ticket_to_session(ticket, index, notes_file_path, config, logger, ingestion_time)
+    except Exception as e:
+        logger.error(f"Failed to process ticket {ticket.get('ticketNumber', 'N/A')}: {e}", exc_info=True)
+        return None
+
+_ticket_worker_args: tuple = ()
+
+def _init_ticket_worker(notes_file_path: str, config: Dict[str, Any], logger_name: str, ingestion_time: datetime.datetime) -> None:
+    """
+    Process-pool initializer: stores the per-run arguments once per worker.
+    The logger is rebuilt from config here because a logger sent to a spawned
+    worker arrives without its handlers, and its messages would be lost.
+    """
+    global _ticket_worker_args
+    _ticket_worker_args = (notes_file_path, config, get_sdc_logger(logger_name, config), ingestion_time)
+
+def _ticket_worker(item) -> bool:
+    """
+    Process-pool worker: transforms and saves one (index, ticket) pair.
+    Returns True on success; failures are logged by _process_ticket or the save.
+    """
+    index, ticket = item
+    notes_file_path, config, logger, ingestion_time = _ticket_worker_args
+    session_object = _process_ticket(ticket, index, notes_file_path, config, logger, ingestion_time)
+    if session_object is None:
+        return False
+    return save_session_to_file(session_object, config, logger)
+
+def _iter_json_items(file_path: str, prefix: str) -> Iterator[Dict[str, Any]]:
+    """Yields the items of the array at `prefix` (e.g. 'tickets.item') one at a time."""
+    with open(file_path, 'rb') as f:
+        # use_float keeps numbers as floats rather than Decimal, matching a full parse.
+        yield from ijson.items(f, prefix, use_float=True)
+
 # =================================================================================
 #  REFACTORED INGESTION FUNCTION
 # =================================================================================
@@ -128,51 +204,106 @@ def ingest_notes(config: Dict[str, Any], logger, **kwargs) -> None:
 
     notes_file_path = config['project_paths']['notes_json']
     state_file_path = os.path.join(config['project_paths']['cache_folder'], STATE_FILE_NAME)
+    # Stat the source first: a missing file needs neither the state file nor a parse.
     current_metadata = state_handler.get_file_metadata(notes_file_path)
+    if not current_metadata:
+        logger.error(f"Failed to load or parse notes.json: No such file: '{notes_file_path}'")
+        return
     ingestor_state = state_handler.load_state(state_file_path, logger)
 
-    if notes_file_path in ingestor_state and ingestor_state[notes_file_path] == current_metadata:
+    previous_metadata = ingestor_state.get(notes_file_path)
+    if state_handler.is_file_unchanged(notes_file_path, previous_metadata, current_metadata):
+        if previous_metadata.get('mtime') != current_metadata.get('mtime'):
+            # Touched but not modified: record the new mtime so the next check is stat-only again.
+            ingestor_state[notes_file_path] = {**previous_metadata, **current_metadata}
+            state_handler.save_state(ingestor_state, state_file_path, logger)
         logger.info(f"NotesJSON file '{notes_file_path}' unchanged. Skipping re-ingestion.")
         return
 
     try:
-        with open(notes_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if ijson is not None:
+            tickets = _iter_json_items(notes_file_path, 'tickets.item')
+            todo_items = _iter_json_items(notes_file_path, 'toDoItems.item')
+        else:
+            with open(notes_file_path, 'rb') as f:
+                data = orjson.loads(f.read())
+            tickets = data.get('tickets', [])
+            todo_items = data.get('toDoItems', [])
     except (FileNotFoundError, KeyError, json.JSONDecodeError) as e:
         logger.error(f"Failed to load or parse notes.json: {e}", exc_info=True)
         return
 
     processed_items = 0
     failed_items = 0
+    pending_sessions = []
+    # One run is one ingestion event, so every session shares its timestamp.
+    ingestion_time = datetime.datetime.now(datetime.timezone.utc)
 
+    # When streaming, a malformed document only surfaces part-way through iteration,
+    # so each pass is guarded and counted as a failure (which also blocks the state update).
     # --- Process tickets ---
-    for index, ticket in enumerate(data.get('tickets', [])):
-        try:
-            ticket_number = ticket.get('ticketNumber')
-            if not ticket_number:
-                logger.warning("Skipping ticket with no ticketNumber.")
-                failed_items += 1
-                continue
-            session_object = _transform_ticket_to_session(ticket, index, notes_file_path, config, logger)
-            save_session_to_file(session_object, config, logger)
-            processed_items += 1
-        except Exception as e:
-            logger.error(f"Failed to process ticket {ticket.get('ticketNumber', 'N/A')}: {e}", exc_info=True)
-            failed_items += 1
+    try:
+        indexed_tickets = enumerate(tickets)
+        # Peek at the head of the stream to decide whether a process pool pays off.
+        head = list(islice(indexed_tickets, PARALLEL_TICKET_THRESHOLD))
+        if len(head) < PARALLEL_TICKET_THRESHOLD:
+            for index, ticket in head:
+                session_object = _process_ticket(ticket, index, notes_file_path, config, logger, ingestion_time)
+                if session_object is None:
+                    failed_items += 1
+                    continue
+                pending_sessions.append(session_object)
+                if len(pending_sessions) >= SAVE_BATCH_SIZE:
+                    # As on the pool path, an item counts as a success only once its file is written.
+                    save_failures = save_sessions_to_files(pending_sessions, config, logger)
+                    processed_items += len(pending_sessions) - save_failures
+                    failed_items += save_failures
+                    pending_sessions = []
+        else:
+            logger.info("Large notes.json detected; transforming tickets on a process pool.")
+            remaining = chain(head, indexed_tickets)
+            with multiprocessing.Pool(
+                initializer=_init_ticket_worker,
+                initargs=(notes_file_path, config, logger.name, ingestion_time)
+            ) as pool:
+                while True:
+                    window = list(islice(remaining, PARALLEL_TICKET_WINDOW))
+                    if not window:
+                        break
+                    for succeeded in pool.imap_unordered(_ticket_worker, window, chunksize=PARALLEL_TICKET_CHUNK_SIZE):
+                        if succeeded:
+                            processed_items += 1
+                        else:
+                            failed_items += 1
+    except Exception as e:
+        logger.error(f"Failed to read tickets from notes.json: {e}", exc_info=True)
+        failed_items += 1
 
     # --- Process standalone ToDo items ---
-    for index, todo in enumerate(data.get('toDoItems', [])):
-        try:
-            session_object = _transform_todo_to_session(todo, index, notes_file_path, config, logger)
-            save_session_to_file(session_object, config, logger)
-            processed_items += 1
-        except Exception as e:
-            logger.error(f"Failed to process ToDo item at index {index}: {e}", exc_info=True)
-            failed_items += 1
+    try:
+        for index, todo in enumerate(todo_items):
+            try:
+                pending_sessions.append(_transform_todo_to_session(todo, index, notes_file_path, config, logger, ingestion_time))
+                if len(pending_sessions) >= SAVE_BATCH_SIZE:
+                    save_failures = save_sessions_to_files(pending_sessions, config, logger)
+                    processed_items += len(pending_sessions) - save_failures
+                    failed_items += save_failures
+                    pending_sessions = []
+            except Exception as e:
+                logger.error(f"Failed to process ToDo item at index {index}: {e}", exc_info=True)
+                failed_items += 1
+    except Exception as e:
+        logger.error(f"Failed to read ToDo items from notes.json: {e}", exc_info=True)
+        failed_items += 1
+
+    save_failures = save_sessions_to_files(pending_sessions, config, logger)
+    processed_items += len(pending_sessions) - save_failures
+    failed_items += save_failures
 
     logger.info(f"Finished NotesJSON ingestion. Total Success: {processed_items}, Total Failed: {failed_items}")
     
     # Update state only if all items were processed successfully
     if failed_items == 0 and current_metadata:
-        ingestor_state[notes_file_path] = current_metadata
+        content_hash = state_handler.get_file_content_hash(notes_file_path)
+        ingestor_state[notes_file_path] = {**current_metadata, 'content_hash': content_hash}
         state_handler.save_state(ingestor_state, state_file_path, logger)
\ No newline at end of file
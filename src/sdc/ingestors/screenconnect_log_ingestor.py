@@ -4,19 +4,36 @@
 
 import pandas as pd
 import os
-import uuid
 import datetime
-from typing import Any, Dict, List, Optional
+import functools
+import uuid
+import warnings
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# pyarrow is optional: with it, CSV exports are tokenized by its multithreaded
+# streaming reader. Without it we fall back to pandas' chunked reader.
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+    from pyarrow import csv as pacsv
+except ImportError:
+    pyarrow = None
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    guess_datetime_format = None
 
 # --- V2 IMPORTS ---
 from sdc.models.session_v2 import Session, SessionSegment, SessionMeta, SessionContext, SessionInsights
-from sdc.utils.session_handler import save_session_to_file
+from sdc.utils.session_handler import save_sessions_to_files
 # --- SHARED UTILS ---
 from sdc.utils import file_ingestor_state_handler as state_handler
 from sdc.utils import session_aggregator
 from sdc.utils.constants import (
     UNDEFINED_TIMESTAMP, SCREENCONNECT_NAMESPACE_OID,
-    SCREENCONNECT_QUERY_FIELDS,
+    SCREENCONNECT_QUERY_FIELD_SET,
 )
 from sdc.api_clients.screenconnect_gateway import ScreenConnectGateway
 from sdc.utils.date_utils import parse_datetime_utc
@@ -25,38 +42,215 @@ from sdc.utils.date_utils import parse_datetime_utc
 # --- CONSTANTS ---
 STATE_FILE_NAME = 'screenconnect_log_ingestor_state.json'
 SESSION_WINDOW_MINUTES = 30
+# The CSV export is read in chunks of this many rows so memory stays bounded by the
+# chunk, not the file; only the columns _convert_raw_data_to_segments reads are loaded.
+CSV_CHUNK_SIZE = 100_000
+CSV_REQUIRED_COLUMNS = ['ParticipantName', 'SessionCustomProperty1']
+CSV_COLUMNS = frozenset({
+    'ProcessType', 'SessionSessionType', 'SessionName', 'ParticipantName', 'ConnectedTime',
+    'DisconnectedTime', 'DurationSeconds', 'ConnectionID', 'SessionCustomProperty1',
+})
+# pyarrow reads in blocks of this many bytes. Every column but DurationSeconds is read
+# as text; the timestamps are parsed by _parse_times_utc, not by Arrow's inference.
+CSV_BLOCK_SIZE = 16 << 20
+CSV_TEXT_COLUMNS = CSV_COLUMNS - {'DurationSeconds'}
+# Only empty fields are missing values, in both readers, so a field that reads "NA"
+# stays text and IDs do not depend on which reader ran.
+CSV_NULL_VALUES = ['']
+# Format directives pyarrow's strptime cannot handle; batches using them are parsed by pandas.
+ARROW_UNSUPPORTED_TIME_DIRECTIVES = ('%z', '%f')
+# Values sampled across a batch to guess its format; they must all agree before pyarrow
+# parses the batch, so a day-ambiguous first row cannot decide the day/month order alone.
+TIME_FORMAT_SAMPLE_SIZE = 32
+# Values used when a record has no such field at all.
+ROW_DEFAULTS = {'ParticipantName': 'Unknown', 'SessionName': 'Unknown'}
+# Sessions are written in batches of this size so file I/O overlaps on a thread pool.
+SAVE_BATCH_SIZE = 256
 
 # =================================================================================
 #  HELPER FUNCTIONS - PURE LOGIC
 # =================================================================================
 
-def _convert_raw_data_to_segments(raw_data: List[Dict], config: Dict[str, Any]) -> List[SessionSegment]:
-    """Converts a list of raw connection records into SessionSegment objects."""
-    all_segments = []
-    for row in raw_data:
-        # Use a deterministic UUID based on the ConnectionID
-        segment_uuid = uuid.uuid5(SCREENCONNECT_NAMESPACE_OID, str(row.get('ConnectionID')))
+def _parse_times_utc(values: Sequence[Any], config: Dict[str, Any]) -> List[datetime.datetime]:
+    """
+    Parses a batch of timestamp strings into UTC datetimes with one vectorized pass,
+    in pyarrow when it can take the batch's guessed format and in pandas otherwise.
+    Batches whose sampled formats disagree are parsed value by value, so the day/month
+    order never depends on which row starts the batch. Anything not matching falls
+    back to the robust date utility; missing or unparseable values become UNDEFINED_TIMESTAMP.
+    """
+    time_format = _guess_time_format(values)
+    parsed = None
+    if pyarrow is not None and time_format and not any(d in time_format for d in ARROW_UNSUPPORTED_TIME_DIRECTIVES):
+        parsed = _strptime_times_utc(values, time_format)
+    if parsed is None:
+        if guess_datetime_format is not None:
+            parsed = pd.to_datetime(pd.Series(values, dtype=object), format=time_format or 'mixed',
+                                    errors='coerce', utc=True, cache=True)
+        else:
+            parsed = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce', utc=True, cache=True)
+    return [
+        value if value is not pd.NaT else (parse_datetime_utc(raw, config) or UNDEFINED_TIMESTAMP)
+        for raw, value in zip(values, parsed.array.to_pydatetime())
+    ]
+
+def _guess_time_format(values: Sequence[Any]) -> Optional[str]:
+    """
+    Guesses the strftime format of a batch from values sampled across it. Returns
+    None when pandas cannot guess it or the samples disagree, e.g. a day-first
+    '13/1/2025' among month-first rows.
+    """
+    if guess_datetime_format is None:
+        return None
+    step = max(1, len(values) // TIME_FORMAT_SAMPLE_SIZE)
+    with warnings.catch_warnings():
+        # A day-first guess warns; disagreeing samples are handled below instead.
+        warnings.simplefilter('ignore', UserWarning)
+        formats = {guess_datetime_format(value) for value in values[::step] if isinstance(value, str)}
+    return formats.pop() if len(formats) == 1 else None
+
+def _strptime_times_utc(values: Sequence[Any], time_format: str) -> Optional[pd.Series]:
+    """
+    Parses a batch of naive timestamp strings with pyarrow's C strptime. Returns a
+    UTC Series with NaT where a value does not match, or None when Arrow rejects the batch.
+    """
+    try:
+        # from_pandas=True reads the NaNs of pandas-read batches as nulls.
+        raw = pyarrow.array(values, type=pyarrow.string(), from_pandas=True)
+        parsed = pc.strptime(raw, format=time_format, unit='us', error_is_null=True)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError):
+        return None
+    # Tagging the naive result as UTC is a metadata-only cast in Arrow, cheaper than
+    # a pandas tz_localize pass over the converted column.
+    return parsed.cast(pyarrow.timestamp('us', tz='UTC')).to_pandas()
+
+def _parse_iso_times_utc(values: Sequence[Any], config: Dict[str, Any]) -> List[datetime.datetime]:
+    """
+    Parses a batch of API timestamps value by value. The API emits ISO 8601, which
+    parse_datetime_utc's datetime.fromisoformat fast path handles faster than a
+    pd.to_datetime batch at any size; missing or unparseable values become UNDEFINED_TIMESTAMP.
+    """
+    return [parse_datetime_utc(value, config) or UNDEFINED_TIMESTAMP for value in values]
+
+@functools.lru_cache(maxsize=65536)
+def _segment_id_for_connection(connection_id: str) -> str:
+    """
+    Deterministic segment ID for a ConnectionID. Memoized because overlapping API
+    pulls and re-exported logs repeat the same connections.
+    """
+    return str(uuid.uuid5(SCREENCONNECT_NAMESPACE_OID, connection_id))
+
+def _iter_pandas_csv_columns(target_file: str) -> Iterator[Dict[str, List[Any]]]:
+    """Yields the usable rows of a CSV export, column by column, one pandas chunk at a time."""
+    for chunk in pd.read_csv(
+        target_file, chunksize=CSV_CHUNK_SIZE, usecols=lambda column: column in CSV_COLUMNS,
+        # Same types and missing values as the pyarrow reader: a ConnectionID of 102
+        # stays '102' rather than 102.0.
+        dtype={column: str for column in CSV_TEXT_COLUMNS},
+        keep_default_na=False, na_values=CSV_NULL_VALUES
+    ):
+        chunk.dropna(subset=CSV_REQUIRED_COLUMNS, inplace=True)
+        yield {column: _pandas_column_values(values) for column, values in chunk.items()}
+
+def _pandas_column_values(values: pd.Series) -> List[Any]:
+    """
+    Native Python values of a pandas column, matching what the pyarrow reader yields:
+    missing values are None, and a column of whole numbers stays int even when
+    pandas widened it to float to hold its NaNs.
+    """
+    if not values.hasnans:
+        # tolist() returns native Python values (as to_dict would) in one C-level pass.
+        return values.tolist()
+    if values.dtype.kind == 'f' and values.dropna().mod(1).eq(0).all():
+        values = values.astype('Int64')
+    return values.astype(object).where(values.notna(), None).tolist()
+
+def _iter_arrow_csv_columns(target_file: str) -> Iterator[Dict[str, List[Any]]]:
+    """Yields the usable rows of a CSV export, column by column, one pyarrow record batch at a time."""
+    read_options = pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE, use_threads=True)
+    convert_options = pacsv.ConvertOptions(
+        column_types={column: pyarrow.string() for column in CSV_TEXT_COLUMNS},
+        null_values=CSV_NULL_VALUES,
+        strings_can_be_null=True  # Empty fields become nulls, as with pandas
+    )
+    with pacsv.open_csv(target_file, read_options=read_options, convert_options=convert_options) as reader:
+        columns = [name for name in reader.schema.names if name in CSV_COLUMNS]
+        for batch in reader:
+            batch = batch.select(columns)
+            # Filter and convert in Arrow; to_pydict() skips pandas' per-value boxing.
+            usable = pc.and_(*(pc.is_valid(batch[column]) for column in CSV_REQUIRED_COLUMNS))
+            yield batch.filter(usable).to_pydict()
+
+def _load_csv_segments(target_file: str, config: Dict[str, Any], logger) -> List[SessionSegment]:
+    """
+    Reads a ScreenConnect CSV export into SessionSegments, preferring pyarrow when
+    installed. Each batch of rows is converted and released before the next is read.
+    """
+    if pyarrow is not None:
+        try:
+            return [
+                segment
+                for columns in _iter_arrow_csv_columns(target_file)
+                for segment in _convert_columns_to_segments(columns, config)
+            ]
+        except pyarrow.ArrowInvalid as e:
+            # Arrow infers DurationSeconds from the first block; a later block that
+            # disagrees aborts the stream, so re-read the file the tolerant way.
+            logger.warning(f"pyarrow could not parse '{target_file}' ({e}). Re-reading it with pandas.")
+    return [
+        segment
+        for columns in _iter_pandas_csv_columns(target_file)
+        for segment in _convert_columns_to_segments(columns, config)
+    ]
+
+def _convert_columns_to_segments(
+    columns: Dict[str, List[Any]],
+    config: Dict[str, Any],
+    parse_times: Callable[[Sequence[Any], Dict[str, Any]], List[datetime.datetime]] = _parse_times_utc
+) -> Iterator[SessionSegment]:
+    """
+    Lazily converts a batch of raw connection records, given as equal-length column
+    lists keyed by field name, into SessionSegment objects. A missing column reads as
+    its default for every row; parse_times converts a column of timestamps.
+    """
+    row_count = len(next(iter(columns.values()), ()))
 
-        # Use the robust date utility to parse and convert to UTC
-        connected_time_utc = parse_datetime_utc(row.get('ConnectedTime'), config) or UNDEFINED_TIMESTAMP
-        disconnected_time_utc = parse_datetime_utc(row.get('DisconnectedTime'), config) or UNDEFINED_TIMESTAMP
+    def column(name: str, default: Any = None) -> List[Any]:
+        values = columns.get(name)
+        return values if values is not None else [default] * row_count
 
-        all_segments.append(SessionSegment(
-            segment_id=str(segment_uuid),
+    connection_ids = column('ConnectionID')
+    connected_times = parse_times(column('ConnectedTime'), config)
+    disconnected_times = parse_times(column('DisconnectedTime'), config)
+
+    for (connection_id, connected_time_utc, disconnected_time_utc, participant_name, session_name,
+         customer_name, process_type, session_type, duration_seconds) in zip(
+        connection_ids, connected_times, disconnected_times,
+        column('ParticipantName', 'Unknown'), column('SessionName', 'Unknown'),
+        column('SessionCustomProperty1'), column('ProcessType'), column('SessionSessionType'),
+        column('DurationSeconds')
+    ):
+        yield SessionSegment(
+            # Use a deterministic UUID based on the ConnectionID
+            segment_id=_segment_id_for_connection(str(connection_id)),
             start_time_utc=connected_time_utc,
             end_time_utc=disconnected_time_utc,
             type="RemoteConnection",
-            author=row.get('ParticipantName', 'Unknown'),
-            content=f"Connected to machine: {row.get('SessionName', 'Unknown')}",
+            author=participant_name,
+            content=f"Connected to machine: {session_name}",
             metadata={
-                "customer_name": row.get('SessionCustomProperty1'),  # For grouping
-                "connection_id": row.get('ConnectionID'),            # Keep original for reference
-                "process_type": row.get('ProcessType'),
-                "session_type": row.get('SessionSessionType'),
-                "duration_seconds": row.get('DurationSeconds'),
+                "customer_name": customer_name,    # For grouping
+                "connection_id": connection_id,    # Keep original for reference
+                "process_type": process_type,
+                "session_type": session_type,
+                "duration_seconds": duration_seconds,
             }
-        ))
-    return all_segments
+        )
+
+def _convert_raw_data_to_segments(raw_data: Sequence[Dict], config: Dict[str, Any]) -> Iterator[SessionSegment]:
+    """Lazily converts a batch of raw connection records (e.g. API rows) into SessionSegment objects."""
+    columns = {name: [row.get(name, ROW_DEFAULTS.get(name)) for row in raw_data] for name in CSV_COLUMNS}
+    return _convert_columns_to_segments(columns, config, parse_times=_parse_iso_times_utc)
 
 
 # =================================================================================
@@ -73,11 +267,13 @@ def ingest_screenconnect(config: Dict[str, Any], logger, **kwargs) -> None:
     filters: List[str] = kwargs.get('filters', [])
 
     logger.info("Starting ScreenConnect ingestion...")
+    # One run is one ingestion event, so every session shares its timestamp.
+    ingestion_time = datetime.datetime.now(datetime.timezone.utc)
 
     sc_ingestor_config = config.get('screenconnect_ingestor', {})
     mode = sc_ingestor_config.get('mode', 'csv')  # Default to 'csv'
 
-    raw_data: List[Dict] = []
+    all_segments: List[SessionSegment] = []
     source_identifiers: List[str] = []
     
     # These will be populated differently depending on the mode
@@ -86,6 +282,12 @@ def ingest_screenconnect(config: Dict[str, Any], logger, **kwargs) -> None:
     current_metadata: Optional[Dict[str, Any]] = None
     target_file: Optional[str] = None
     new_last_processed_utc: Optional[str] = None
+    resume_after = 0
+    # Session IDs are uuid5(run_namespace, group index). Each run draws a fresh namespace,
+    # so re-ingesting a file never overwrites (possibly enriched) sessions of an earlier run;
+    # a resumed run reuses its checkpoint's namespace, so re-saving a session that was
+    # written just before the crash overwrites it instead of duplicating it.
+    run_namespace = uuid.uuid4()
 
     try:
         if mode == 'csv':
@@ -93,11 +295,13 @@ def ingest_screenconnect(config: Dict[str, Any], logger, **kwargs) -> None:
             state_file_path = os.path.join(config['project_paths']['cache_folder'], STATE_FILE_NAME)
             
             try:
-                csv_files = sorted([f for f in os.listdir(log_dir) if f.endswith('.csv')])
-                if not csv_files:
+                # Only the lexicographically first CSV is ingested, so take the min
+                # rather than sorting every name in the directory.
+                with os.scandir(log_dir) as entries:
+                    target_file = min((e.path for e in entries if e.name.endswith('.csv')), default=None)
+                if not target_file:
                     logger.warning(f"No CSV files found in {log_dir}")
                     return
-                target_file = os.path.join(log_dir, csv_files[0])
                 source_identifiers = [target_file]
             except FileNotFoundError:
                 logger.error(f"Log directory not found: {log_dir}")
@@ -106,14 +310,27 @@ def ingest_screenconnect(config: Dict[str, Any], logger, **kwargs) -> None:
             ingestor_state = state_handler.load_state(state_file_path, logger)
             current_metadata = state_handler.get_file_metadata(target_file)
 
-            if ingestor_state.get(target_file) == current_metadata:
+            file_state = ingestor_state.get(target_file)
+            # A checkpoint entry marks an interrupted run, never a finished one.
+            if (file_state and 'sessions_saved' not in file_state
+                    and state_handler.is_file_unchanged(target_file, file_state, current_metadata)):
+                if file_state.get('mtime') != current_metadata.get('mtime'):
+                    # Touched but not modified: record the new mtime so the next check is stat-only again.
+                    ingestor_state[target_file] = {**file_state, **current_metadata}
+                    state_handler.save_state(ingestor_state, state_file_path, logger)
                 logger.info(f"File '{target_file}' unchanged. Skipping.")
                 return
+            # An interrupted run over this same version of the file leaves a checkpoint;
+            # resume after the sessions it already saved instead of saving them again.
+            if file_state and 'sessions_saved' in file_state and all(
+                file_state.get(key) == value for key, value in current_metadata.items()
+            ):
+                resume_after = file_state['sessions_saved']
+                if file_state.get('run_namespace'):
+                    run_namespace = uuid.UUID(file_state['run_namespace'])
             
-            df = pd.read_csv(target_file)
-            df.dropna(subset=['ParticipantName', 'SessionCustomProperty1'], inplace=True)
-            raw_data = df.to_dict('records')
-            logger.info(f"Loaded {len(raw_data)} events from {target_file}")
+            all_segments = _load_csv_segments(target_file, config, logger)
+            logger.info(f"Loaded {len(all_segments)} events from {target_file}")
 
         elif mode == 'api':
             api_config = sc_ingestor_config.get('api_config', {})
@@ -139,7 +356,7 @@ def ingest_screenconnect(config: Dict[str, Any], logger, **kwargs) -> None:
                     all_filter_parts.append(f"ConnectedTime > '{last_processed_utc}'")
                 else:
                     # Default to 7 days ago if no start_date and no saved state.
-                    seven_days_ago = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=7)
+                    seven_days_ago = ingestion_time - datetime.timedelta(days=7)
                     all_filter_parts.append(f"ConnectedTime > '{seven_days_ago.isoformat()}'")
 
             if end_date:
@@ -160,8 +377,8 @@ def ingest_screenconnect(config: Dict[str, Any], logger, **kwargs) -> None:
                     logger.warning(f"Invalid filter '{f}'. Skipping. Use Key=Value.")
                     continue
                 key, value = f.split('=', 1)
-                if key not in SCREENCONNECT_QUERY_FIELDS:
-                    logger.error(f"Invalid filter key '{key}'. Allowed keys: {sorted(SCREENCONNECT_QUERY_FIELDS)}")
+                if key not in SCREENCONNECT_QUERY_FIELD_SET:
+                    logger.error(f"Invalid filter key '{key}'. Allowed keys: {sorted(SCREENCONNECT_QUERY_FIELD_SET)}")
                     continue
                 safe_value = value.replace("'", "\\'")
                 all_filter_parts.append(f"{key} = '{safe_value}'")
@@ -182,34 +399,38 @@ def ingest_screenconnect(config: Dict[str, Any], logger, **kwargs) -> None:
             raw_data = gateway.fetch_connections(filter_expression)
             
             if raw_data:
-                # Find the latest ConnectedTime in the new data to update the state
-                latest_record = max(raw_data, key=lambda x: pd.to_datetime(x.get('ConnectedTime', '')))
-                new_last_processed_utc = pd.to_datetime(latest_record.get('ConnectedTime')).isoformat()
                 logger.info(f"Fetched {len(raw_data)} new records from API.")
+                all_segments.extend(_convert_raw_data_to_segments(raw_data, config))
+                # The latest ConnectedTime in the new data updates the state. Segment
+                # start times are the already-parsed ConnectedTimes; unparseable ones
+                # are UNDEFINED_TIMESTAMP and never win.
+                latest_connected_time = max(segment.start_time_utc for segment in all_segments)
+                if latest_connected_time > UNDEFINED_TIMESTAMP:
+                    new_last_processed_utc = latest_connected_time.isoformat()
 
     except Exception as e:
         logger.error(f"Failed to retrieve data in '{mode}' mode: {e}", exc_info=True)
         return
 
-    if not raw_data:
+    if not all_segments:
         logger.info("No new raw data to process.")
         return
 
-    # 1. Convert all raw data (from whatever source) to SessionSegment objects
-    all_segments = _convert_raw_data_to_segments(raw_data, config)
-
-    # 2. Group segments using the session aggregator
+    # 1. Group segments using the session aggregator
     grouped_sessions = session_aggregator.group_segments_by_time_gap_and_keys(
         segments=all_segments,
         time_gap=datetime.timedelta(minutes=SESSION_WINDOW_MINUTES),
         grouping_keys=['customer_name', 'author']
     )
     logger.info(f"Grouped {len(all_segments)} events into {len(grouped_sessions)} consolidated sessions.")
+    if resume_after:
+        logger.info(f"Resuming '{target_file}': skipping {resume_after} sessions saved by an interrupted run.")
 
-    # 3. Transform each group into a Session object and save
+    # 2. Transform each group into a Session object and save
     processed_count = 0
     failed_count = 0
-    for group in grouped_sessions:
+    pending_sessions = []
+    for group_index, group in enumerate(islice(grouped_sessions, resume_after, None), start=resume_after):
         try:
             first_segment = group[0]
             session_object = session_aggregator.transform_grouped_segments_to_session(
@@ -217,15 +438,35 @@ def ingest_screenconnect(config: Dict[str, Any], logger, **kwargs) -> None:
                 source_system="ScreenConnect",
                 source_identifiers=source_identifiers,
                 customer_name=first_segment.metadata.get('customer_name'),
-                source_title=f"ScreenConnect Session for {first_segment.author}"
+                source_title=f"ScreenConnect Session for {first_segment.author}",
+                ingestion_time=ingestion_time,
+                session_id=str(uuid.uuid5(run_namespace, str(group_index)))
             )
-            save_session_to_file(session_object, config, logger)
-            processed_count += 1
+            pending_sessions.append(session_object)
+            if len(pending_sessions) >= SAVE_BATCH_SIZE:
+                # A session counts as a success only once its file is written.
+                save_failures = save_sessions_to_files(pending_sessions, config, logger)
+                processed_count += len(pending_sessions) - save_failures
+                failed_count += save_failures
+                pending_sessions = []
+                if mode == 'csv' and failed_count == 0:
+                    # Checkpoint after each fully saved batch. A crash mid-batch redoes at
+                    # most that batch on resume; its sessions keep their IDs and overwrite.
+                    ingestor_state[target_file] = {
+                        **current_metadata,
+                        'sessions_saved': resume_after + processed_count,
+                        'run_namespace': str(run_namespace),
+                    }
+                    state_handler.save_state(ingestor_state, state_file_path, logger)
         except Exception as e:
             start_time_for_log = group[0].start_time_utc if group else 'Unknown Time'
             logger.error(f"Error processing session group starting at {start_time_for_log}: {e}", exc_info=True)
             failed_count += 1
 
+    save_failures = save_sessions_to_files(pending_sessions, config, logger)
+    processed_count += len(pending_sessions) - save_failures
+    failed_count += save_failures
+
     logger.info(f"Finished ScreenConnect ingestion. Total Success: {processed_count}, Total Failed: {failed_count}")
 
     # --- Final state saving ---
@@ -234,7 +475,8 @@ def ingest_screenconnect(config: Dict[str, Any], logger, **kwargs) -> None:
         return
 
     if mode == 'csv' and target_file:
-        ingestor_state[target_file] = current_metadata
+        content_hash = state_handler.get_file_content_hash(target_file)
+        ingestor_state[target_file] = {**current_metadata, 'content_hash': content_hash}
         state_handler.save_state(ingestor_state, state_file_path, logger)
         
     # Only save state in API mode if we are doing an incremental run (no manual dates)
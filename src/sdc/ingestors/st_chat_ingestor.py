@@ -3,9 +3,8 @@
 
 import json
 import os
-import uuid
 import hashlib
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List
 
 # --- V2 IMPORTS ---
@@ -14,6 +13,7 @@ from sdc.utils.session_handler import save_session_to_file
 # --- SHARED UTILS ---
 from sdc.utils import file_ingestor_state_handler as state_handler
 from sdc.utils.date_utils import parse_datetime_utc
+from sdc.utils.session_builder import new_uuid4_str
 from sdc.utils.file_utils import find_files_recursive
 from sdc.utils import session_aggregator
 from sdc.utils.constants import UNDEFINED_TIMESTAMP
@@ -45,6 +45,8 @@ Loads ST .jsonl chat logs, segments them into sessions,
         logger: The SDC logger instance.
     """
     logger.info("Starting ingestion for source: ST")
+    # One run is one ingestion event, so every session shares its timestamp.
+    ingestion_time = datetime.now(timezone.utc)
 
     try:
         input_folder = config['project_paths']['sillytavern_chat_input_folder']
@@ -122,7 +124,7 @@ Loads ST .jsonl chat logs, segments them into sessions,
             all_segments = []
             for msg in valid_messages:
                 all_segments.append(SessionSegment(
-                    segment_id=str(uuid.uuid4()),
+                    segment_id=new_uuid4_str(),
                     start_time_utc=parse_datetime_utc(msg.get('send_date'), config, default_on_error=UNDEFINED_TIMESTAMP),
                     end_time_utc=parse_datetime_utc(msg.get('send_date'), config, default_on_error=UNDEFINED_TIMESTAMP),
                     type="ChatMessage",
@@ -153,7 +155,8 @@ Loads ST .jsonl chat logs, segments them into sessions,
                         source_identifiers=[file_path],
                         source_title=f"SillyTavern Chat with {character_name}",
                         processing_status="Complete",  # SillyTavern sessions don't need linking
-                        links=[f"st_chat_id:{chat_id_hash}"]
+                        links=[f"st_chat_id:{chat_id_hash}"],
+                        ingestion_time=ingestion_time
                     )
                     save_session_to_file(session_object, config, logger)
                     total_sessions_created += 1
@@ -1,6 +1,5 @@
 import os
 import json
-import uuid
 from typing import Dict, Any, List
 from datetime import datetime, timezone, timedelta
 from sdc.api_clients.syncro_gateway import SyncroGateway
@@ -8,13 +7,15 @@ from sdc.api_clients.syncro_gateway import SyncroGateway
 from sdc.models.session_v2 import Session, SessionSegment, SessionMeta, SessionContext, SessionInsights
 from sdc.utils.session_handler import save_session_to_file
 from sdc.utils.date_utils import parse_datetime_utc
-from sdc.utils.session_builder import build_session
+from sdc.utils.session_builder import build_session, new_uuid4_str
 from sdc.utils import file_ingestor_state_handler as state_handler
 
 STATE_FILE_NAME = 'syncro_ticket_ingestor_state.json'
 
 def ingest_syncro_tickets(config: Dict[str, Any], logger, **kwargs) -> None:
     logger.info("Starting Syncro Ticket Ingestor...")
+    # One run is one ingestion event, so every session shares its timestamp.
+    ingestion_time = datetime.now(timezone.utc)
 
     api_config = config.get('syncro_api', {})
     syncro_test_ticket_file = api_config.get('syncro_test_ticket_file')
@@ -63,7 +64,7 @@ def ingest_syncro_tickets(config: Dict[str, Any], logger, **kwargs) -> None:
                 logger.info(f"Fetching tickets updated since: {last_updated_at_str}")
             else:
                 # New logic for initial fetch: only get tickets from the last 6 months (180 days)
-                six_months_ago = datetime.now(timezone.utc) - timedelta(days=180)
+                six_months_ago = ingestion_time - timedelta(days=180)
                 created_after_str = six_months_ago.strftime('%Y-%m-%dT%H:%M:%SZ')
                 params['created_after'] = created_after_str
                 logger.info(f"No previous timestamp found. Performing initial fetch for tickets created after: {created_after_str}")
@@ -106,7 +107,7 @@ def ingest_syncro_tickets(config: Dict[str, Any], logger, **kwargs) -> None:
 
             # Create the first segment for the ticket creation event itself
             segments.append(SessionSegment(
-                segment_id=str(uuid.uuid4()),
+                segment_id=new_uuid4_str(),
                 start_time_utc=ticket_creation_time,
                 end_time_utc=ticket_creation_time,
                 type="TicketCreation",
@@ -136,7 +137,7 @@ def ingest_syncro_tickets(config: Dict[str, Any], logger, **kwargs) -> None:
 
                     comment_time = parse_datetime_utc(comment.get('created_at'), config) or ticket_creation_time
                     segments.append(SessionSegment(
-                        segment_id=str(uuid.uuid4()),
+                        segment_id=new_uuid4_str(),
                         start_time_utc=comment_time,
                         end_time_utc=comment_time,
                         type=segment_type,
@@ -158,7 +159,8 @@ def ingest_syncro_tickets(config: Dict[str, Any], logger, **kwargs) -> None:
                 customer_id=ticket.get('customer_id'),
                 contact_id=ticket.get('contact_id'),
                 source_title=ticket.get('subject'),
-                processing_status="Linked"  # Pre-linked since Syncro provides IDs
+                processing_status="Linked",  # Pre-linked since Syncro provides IDs
+                ingestion_time=ingestion_time
             )
 
             save_session_to_file(session_object, config, logger)
@@ -1,3 +1,4 @@
+import hashlib
 from typing import Optional, Literal, Union
 
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -11,6 +12,11 @@ ChatClient = Union[ChatGoogleGenerativeAI, ChatOpenAI]
 # capabilities are added to config.yaml.
 ChatCapability = Literal['lightweight', 'complex', 'general', 'flash']
 
+# Clients are reused across calls (e.g. one per session in the LLM analyzer),
+# keyed by everything that determines how they are constructed. The API key is
+# keyed by its digest so the raw secret is not held in the cache keys.
+_client_cache: dict = {}
+
 def get_chat_client(
     capability: ChatCapability,
     config: dict,
@@ -18,7 +24,8 @@ def get_chat_client(
 ) -> Optional[ChatClient]:
     """
     Factory that returns a client object for a Chat Completion API.
-    Reads config to select and configure the correct provider.
+    Reads config to select and configure the correct provider. Clients are
+    cached per (provider, model, endpoint, key digest), so repeated calls are cheap.
     """
     try:
         llm_provider_config = config.get('llm_provider_config')
@@ -41,6 +48,12 @@ def get_chat_client(
             logger.error("[AUDIT] Failed to instantiate LLM client. Reason: Model for capability '%s' not found for provider '%s'.", capability, active_provider)
             return None
 
+        api_key_setting = provider_config.get('api_key')
+        api_key_digest = hashlib.sha256(str(api_key_setting).encode('utf-8')).hexdigest() if api_key_setting is not None else None
+        cache_key = (active_provider, model_name, provider_config.get('base_url'), api_key_digest)
+        if cache_key in _client_cache:
+            return _client_cache[cache_key]
+
         # NOTE: these branches match on the *value* of llm_provider_config.active_provider,
         # which must equal the exact name of its own config block below
         # ('google_gemini' / 'local_llm'). Renaming a block requires renaming
@@ -51,7 +64,9 @@ def get_chat_client(
                 "[AUDIT] LLM client instantiated successfully. Capability: '%s', Provider: '%s', Model: '%s'",
                 capability, active_provider, model_name
             )
-            return ChatGoogleGenerativeAI(model=model_name, google_api_key=api_key)
+            client = ChatGoogleGenerativeAI(model=model_name, google_api_key=api_key)
+            _client_cache[cache_key] = client
+            return client
 
         elif active_provider == 'local_llm':
             base_url = provider_config.get('base_url')
@@ -63,7 +78,9 @@ def get_chat_client(
                 "[AUDIT] LLM client instantiated successfully. Capability: '%s', Provider: '%s', Model: '%s'",
                 capability, active_provider, model_name
             )
-            return ChatOpenAI(model=model_name, base_url=base_url, api_key=api_key)
+            client = ChatOpenAI(model=model_name, base_url=base_url, api_key=api_key)
+            _client_cache[cache_key] = client
+            return client
 
         else:
             logger.error("[AUDIT] Failed to instantiate LLM client. Reason: Unsupported active_provider '%s'. Capability: '%s'", active_provider, capability)
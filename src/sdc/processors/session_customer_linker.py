@@ -9,7 +9,7 @@ import json
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from thefuzz import fuzz, process
+from rapidfuzz import fuzz, process, utils as fuzz_utils
 
 # --- V2 IMPORTS ---
 from sdc.models.session_v2 import Session
@@ -38,41 +38,83 @@ def _find_winner_from_llm_response(llm_response: str, candidates: List[Any], mat
     logger.error(f"LLM response '{llm_response.strip()}' did not match any of the provided candidate names. Candidates were: {candidate_names_for_log}")
     return None
 
+# thefuzz's default processing (force_ascii) deleted the Latin-1 range before scoring.
+_LATIN1_DELETIONS = dict.fromkeys(range(128, 256))
+
+def _normalize_name(name: str) -> str:
+    """Normalizes a name the way thefuzz's full_process did, so scores match its behaviour."""
+    return fuzz_utils.default_process(name.translate(_LATIN1_DELETIONS))
+
+def _build_match_index(candidates: List[Dict[str, Any]], match_key: str) -> Dict[str, Any]:
+    """
+    Precomputes the lookup structures _find_best_match needs for a candidate list,
+    so repeated lookups against the same list don't re-lowercase every name.
+    """
+    exact_lookup: Dict[str, List[Dict[str, Any]]] = {}
+    choices: Dict[str, Dict[str, Any]] = {}
+    for c in candidates:
+        # A record may carry the key with a null value; it can never match, so skip it.
+        name = c.get(match_key) or ''
+        if not name:
+            continue
+        exact_lookup.setdefault(name.lower(), []).append(c)
+        choices[name] = c
+    choice_names = tuple(choices)
+    return {
+        'exact_lookup': exact_lookup,
+        'choices': choices,
+        'choice_names': choice_names,
+        'processed_names': [_normalize_name(n) for n in choice_names],
+    }
+
 def _find_best_match(
     guessed_name: str,
     candidates: List[Dict[str, Any]],
     match_key: str,
     item_type: str,
     config: Dict[str, Any],
-    logger
+    logger,
+    match_index: Optional[Dict[str, Any]] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Finds the best candidate match for a guessed name using exact, fuzzy, and LLM-based logic.
+    Pass a match_index from _build_match_index to reuse it across calls for the same candidates.
     """
     winner = None
     fuzzy_threshold = config['processing_defaults']['customer_linking_fuzzy_match_threshold']
+    if match_index is None:
+        match_index = _build_match_index(candidates, match_key)
 
     # Step 1: Exact Match
-    exact_matches = [c for c in candidates if c.get(match_key, '').lower() == guessed_name.lower()]
+    exact_matches = match_index['exact_lookup'].get(guessed_name.lower(), [])
     if len(exact_matches) == 1:
         winner = exact_matches[0]
         logger.info(f"Found single exact match for {item_type} '{guessed_name}': '{winner.get(match_key)}'")
         return winner
 
     # Step 2: Fuzzy Match and LLM Disambiguation
-    choices = {c[match_key]: c for c in candidates if c.get(match_key)}
+    choices = match_index['choices']
     if not choices:
         logger.warning(f"No candidates with a '{match_key}' to match against for {item_type} '{guessed_name}'.")
         return None
 
-    top_matches = process.extract(guessed_name, choices.keys(), limit=5, scorer=fuzz.token_set_ratio)
-    viable_matches = [m for m in top_matches if m[1] >= 60]
+    # Choices are already preprocessed, so only the query is normalized here; results are
+    # mapped back to the original names through the index rapidfuzz returns.
+    # rapidfuzz scores are floats; they are rounded to the integers thefuzz returned so
+    # the 60-point floor and the configured threshold keep their meaning.
+    choice_names = match_index['choice_names']
+    top_matches = process.extract(
+        _normalize_name(guessed_name), match_index['processed_names'],
+        limit=5, scorer=fuzz.token_set_ratio, processor=None
+    )
+    scored_matches = [(choice_names[idx], round(score), idx) for _, score, idx in top_matches]
+    viable_matches = [match for match in scored_matches if match[1] >= 60]
 
     if not viable_matches:
         logger.warning(f"No plausible {item_type} matches found for '{guessed_name}' (best score < 60).")
         return None
 
-    best_match_name, best_score = viable_matches[0]
+    best_match_name, best_score, _ = viable_matches[0]
 
     if len(viable_matches) == 1 and best_score >= fuzzy_threshold:
         winner = choices[best_match_name]
@@ -121,6 +163,7 @@ def link_customers_to_sessions(config: Dict[str, Any], logger):
         return
 
     logger.info(f"Successfully loaded {len(customer_cache)} customers from lean cache.")
+    customer_match_index = _build_match_index(customer_cache, 'business_name')
 
     processed_files, linked_files, error_files, skipped_files = 0, 0, 0, 0
 
@@ -128,6 +171,7 @@ def link_customers_to_sessions(config: Dict[str, Any], logger):
     # This is especially useful for sources like ScreenConnect with repeated, non-standard names.
     customer_link_cache: Dict[str, Optional[Dict[str, Any]]] = {}
     contact_link_cache: Dict[tuple[str, str], Optional[Dict[str, Any]]] = {}
+    contact_match_indexes: Dict[str, Dict[str, Any]] = {}
 
     with os.scandir(sessions_output_folder) as it:
         for entry in it:
@@ -183,7 +227,8 @@ def link_customers_to_sessions(config: Dict[str, Any], logger):
                     match_key='business_name',
                     item_type='company',
                     config=config,
-                    logger=logger
+                    logger=logger,
+                    match_index=customer_match_index
                 )
 
                 # Cache the result (even if it's None) to prevent re-processing
@@ -213,13 +258,16 @@ def link_customers_to_sessions(config: Dict[str, Any], logger):
                             logger.info(f"Using cached result for contact '{guessed_contact}': No link found.")
                     else:
                         logger.info(f"Attempting to link new contact '{guessed_contact}' for customer '{authoritative_customer_name}'")
+                        if authoritative_customer_name not in contact_match_indexes:
+                            contact_match_indexes[authoritative_customer_name] = _build_match_index(known_contacts, 'name')
                         contact_winner_obj = _find_best_match(
                             guessed_name=guessed_contact,
                             candidates=known_contacts,
                             match_key='name',
                             item_type='contact',
                             config=config,
-                            logger=logger
+                            logger=logger,
+                            match_index=contact_match_indexes[authoritative_customer_name]
                         )
 
                         # Cache the contact linking result
@@ -5,17 +5,25 @@ Utility for loading and parsing the project's configuration file.
 
 import os
 import re
+from collections import defaultdict, deque
 from typing import Dict, Any, Optional, Union, List
 
 import yaml
 
 _cached_config: Optional[Dict[str, Any]] = None
 
+# Matches a `{{key}}` placeholder, capturing the referenced key.
+_PLACEHOLDER_PATTERN = re.compile(r'\{\{(\w+)\}\}')
+
 def load_yaml_config(path: str) -> Dict[str, Any]:
     """Loads and parses a YAML config file, returning {} for an empty file."""
     with open(path, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f) or {}
 
+def _substitute_placeholders(value: str, templates: Dict[str, Any]) -> str:
+    """Replaces every known `{{key}}` in `value` in a single scan; unknown keys are left as-is."""
+    return _PLACEHOLDER_PATTERN.sub(lambda m: str(templates.get(m.group(1), m.group(0))), value)
+
 def resolve_placeholders(obj: Union[Dict, List], templates: Dict[str, str]) -> bool:
     """
     To recursively search through the configuration dictionary and replace
@@ -28,13 +36,11 @@ def resolve_placeholders(obj: Union[Dict, List], templates: Dict[str, str]) -> b
     if isinstance(obj, dict):
         for key, value in obj.items():
             if isinstance(value, str):
-                new_value = value
-                for placeholder, replacement in templates.items():
-                    if f"{{{{{placeholder}}}}}" in new_value:
-                        new_value = new_value.replace(f"{{{{{placeholder}}}}}", replacement)
-                        made_replacement = True
-                
+                if '{{' not in value:
+                    continue  # Leaf string with nothing left to substitute
+                new_value = _substitute_placeholders(value, templates)
                 if new_value != value:
+                    made_replacement = True
                     if 'folder' in key or 'path' in key:
                         obj[key] = os.path.normpath(new_value)
                     else:
@@ -47,13 +53,11 @@ def resolve_placeholders(obj: Union[Dict, List], templates: Dict[str, str]) -> b
     elif isinstance(obj, list):
         for i, item in enumerate(obj):
             if isinstance(item, str):
-                new_item = item
-                for placeholder, replacement in templates.items():
-                    if f"{{{{{placeholder}}}}}" in new_item:
-                        new_item = new_item.replace(f"{{{{{placeholder}}}}}", replacement)
-                        made_replacement = True
-                
+                if '{{' not in item:
+                    continue  # Leaf string with nothing left to substitute
+                new_item = _substitute_placeholders(item, templates)
                 if new_item != item:
+                    made_replacement = True
                     obj[i] = new_item # No path normalization needed for list items by default
             
             elif isinstance(item, (dict, list)):
@@ -66,15 +70,46 @@ def resolve_placeholders(obj: Union[Dict, List], templates: Dict[str, str]) -> b
 def resolve_project_paths(project_root: str, project_paths: Dict[str, Any]) -> Dict[str, Any]:
     """
     Seeds `project_paths` with `project_root` and resolves `{{...}}`
-    placeholders within it in place (multi-pass, since some paths reference
-    other paths, e.g. input_folder references data_folder). Returns the same
-    dict, for use both as the resolved project_paths section and as the
+    placeholders within it in place. Some paths reference other paths (e.g.
+    input_folder references data_folder), so keys are substituted in
+    dependency order and each value is rewritten exactly once. Returns the
+    same dict, for use both as the resolved project_paths section and as the
     template source for resolving placeholders elsewhere in a config.
     """
     project_paths['project_root'] = project_root
-    for _ in range(5):  # Limit iterations to prevent infinite loops
-        if not resolve_placeholders(project_paths, project_paths):
-            break
+
+    # --- Build the key -> referenced-keys graph ---
+    dependencies: Dict[str, set] = {}
+    for key, value in project_paths.items():
+        referenced = _PLACEHOLDER_PATTERN.findall(value) if isinstance(value, str) else []
+        dependencies[key] = {name for name in referenced if name in project_paths and name != key}
+
+    # --- Kahn's algorithm: resolve a key only once everything it references is resolved ---
+    dependents: Dict[str, List[str]] = defaultdict(list)
+    pending_counts = {key: len(deps) for key, deps in dependencies.items()}
+    for key, deps in dependencies.items():
+        for dep in deps:
+            dependents[dep].append(key)
+
+    ready = deque(key for key, count in pending_counts.items() if count == 0)
+    while ready:
+        key = ready.popleft()
+        value = project_paths[key]
+        if isinstance(value, str) and '{{' in value:
+            new_value = _substitute_placeholders(value, project_paths)
+            if new_value != value:
+                if 'folder' in key or 'path' in key:
+                    new_value = os.path.normpath(new_value)
+                project_paths[key] = new_value
+        elif isinstance(value, (dict, list)):
+            resolve_placeholders(value, project_paths)
+
+        for dependent in dependents[key]:
+            pending_counts[dependent] -= 1
+            if pending_counts[dependent] == 0:
+                ready.append(dependent)
+
+    # Keys caught in a reference cycle are never released above and are left as-is.
     return project_paths
 
 def _find_and_load_config() -> Optional[Dict[str, Any]]:
@@ -144,6 +179,9 @@ def _find_and_load_config() -> Optional[Dict[str, Any]]:
 def load_config() -> Optional[Dict[str, Any]]:
     """
     Public function to get the application configuration.
+
+    The config is found, parsed, and resolved once per process; later calls
+    return the same cached dict without touching the filesystem.
     """
     global _cached_config
     if _cached_config is None:
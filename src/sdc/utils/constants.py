@@ -19,3 +19,5 @@ SCREENCONNECT_QUERY_FIELDS = [
       "SessionSessionID",
       "ClientType"
 ]
+# Set form for O(1) filter-key validation; the list above keeps the API's field order.
+SCREENCONNECT_QUERY_FIELD_SET = frozenset(SCREENCONNECT_QUERY_FIELDS)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """Utility functions for parsing and handling dates and times."""
 
+import functools
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, Optional
 
@@ -9,6 +10,28 @@ from dateutil.parser import parse
 
 from sdc.utils.sdc_logger import get_sdc_logger
 
+@functools.lru_cache(maxsize=16384)
+def _parse_to_utc(date_string: str) -> datetime:
+    """
+    Parses a date string into a UTC datetime, raising on failure.
+
+    Memoized because sources repeat the same timestamp strings heavily (e.g. every
+    note on a ticket); datetimes are immutable, so sharing cached results is safe.
+    Failures raise and are therefore never cached.
+    """
+    try:
+        # Fast path: the C-implemented ISO 8601 parser covers what our sources emit.
+        dt_object = datetime.fromisoformat(date_string)
+    except ValueError:
+        # Use dateutil.parser.parse for robust, flexible parsing of everything else
+        dt_object = parse(date_string)
+
+    # If the datetime object is naive (no timezone), assume UTC.
+    if dt_object.tzinfo is None:
+        return dt_object.replace(tzinfo=timezone.utc)
+    # If it has timezone info, convert it to UTC to standardize.
+    return dt_object.astimezone(timezone.utc)
+
 def parse_datetime_utc(
     date_string: Optional[str],
     config: Dict[str, Any],
@@ -37,15 +60,7 @@ def parse_datetime_utc(
         return default_on_error
 
     try:
-        # Use dateutil.parser.parse for robust, flexible parsing
-        dt_object = parse(date_string)
-
-        # If the datetime object is naive (no timezone), assume UTC.
-        if dt_object.tzinfo is None:
-            return dt_object.replace(tzinfo=timezone.utc)
-        # If it has timezone info, convert it to UTC to standardize.
-        return dt_object.astimezone(timezone.utc)
-
+        return _parse_to_utc(date_string)
     except (ValueError, TypeError, AttributeError) as e:
         logger.warning(f"Failed to parse date string: '{date_string}'. Error: {e}. Returning default_on_error.")
         return default_on_error
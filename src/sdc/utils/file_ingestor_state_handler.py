@@ -6,8 +6,13 @@ Manages loading, saving, and checking metadata for files to prevent re-processin
 
 import os
 import json
+import hashlib
 from typing import Any, Dict, Optional
 
+import orjson
+
+from sdc.utils.file_utils import ensure_directory
+
 def get_file_metadata(file_path: str) -> Dict[str, Any]:
     """Returns file size and modification time."""
     try:
@@ -16,6 +21,35 @@ def get_file_metadata(file_path: str) -> Dict[str, Any]:
     except FileNotFoundError:
         return {}
 
+def get_file_content_hash(file_path: str) -> Optional[str]:
+    """Returns a BLAKE2b digest of the file's bytes, or None if it cannot be read."""
+    digest = hashlib.blake2b(digest_size=32)
+    try:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def is_file_unchanged(file_path: str, previous_metadata: Optional[Dict[str, Any]], current_metadata: Dict[str, Any]) -> bool:
+    """
+    Decides whether a file matches the metadata recorded when it was last processed.
+
+    Matching size and mtime is treated as unchanged without reading the file. If
+    only the mtime differs (a touch, a copy, or a coarse-mtime filesystem), the
+    file's content hash is compared against the recorded 'content_hash', so the
+    file is not re-ingested when its bytes are identical.
+    """
+    if not previous_metadata or not current_metadata:
+        return False
+    if previous_metadata.get('size') != current_metadata.get('size'):
+        return False
+    if previous_metadata.get('mtime') == current_metadata.get('mtime'):
+        return True
+    previous_hash = previous_metadata.get('content_hash')
+    return previous_hash is not None and previous_hash == get_file_content_hash(file_path)
+
 def load_state(state_file_path: str, logger, default_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Loads an ingestor's state from a JSON file. If the file does not exist,
@@ -33,8 +67,8 @@ def load_state(state_file_path: str, logger, default_state: Optional[Dict[str, A
     if default_state is None:
         default_state = {}
     try:
-        with open(state_file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(state_file_path, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         logger.info(f"State file not found at {state_file_path}. Creating it with default state.")
         save_state(default_state, state_file_path, logger)
@@ -77,12 +111,16 @@ def save_state(state: Dict[str, Any], state_file_path: str, logger) -> None:
     """Saves the ingestor state to a JSON file using an atomic write operation."""
     temp_file_path = state_file_path + ".tmp"
     try:
-        os.makedirs(os.path.dirname(state_file_path), exist_ok=True)
-        with open(temp_file_path, 'w', encoding='utf-8') as f:
-            json.dump(state, f, indent=4)
+        ensure_directory(os.path.dirname(state_file_path))
+        with open(temp_file_path, 'wb') as f:
+            f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
         os.replace(temp_file_path, state_file_path)
     except IOError as e:
         logger.error(f"Failed to save state to {state_file_path}: {e}")
     finally:
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
\ No newline at end of file
+        # After a successful os.replace the temp file is already gone; only a
+        # failed write leaves one behind. Try the remove rather than stat first.
+        try:
+            os.remove(temp_file_path)
+        except FileNotFoundError:
+            pass
\ No newline at end of file
@@ -1,11 +1,27 @@
 # -*- coding: utf-8 -*-
 """General file system utilities."""
 
+import functools
 import glob
 import os
 from typing import List
 
 
+@functools.lru_cache(maxsize=None)
+def ensure_directory(dir_path: str) -> None:
+    """
+    Creates a directory (and any parents) if needed, once per process per path.
+
+    Callers that write many files into the same folder (one per session, or a
+    state file per run) would otherwise pay a mkdir syscall on every write.
+    Assumes directories are not removed while the process is running.
+
+    Args:
+        dir_path: The directory to create.
+    """
+    os.makedirs(dir_path, exist_ok=True)
+
+
 def find_files(root_dir: str, pattern: str) -> List[str]:
     """
     Finds all files matching a pattern in a directory (non-recursive).
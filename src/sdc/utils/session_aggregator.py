@@ -2,7 +2,8 @@
 """Utility for aggregating individual SessionSegments into complete Session objects."""
 
 import datetime
-from typing import Any, List, Optional
+from operator import attrgetter
+from typing import Any, Callable, List, Optional
 
 from sdc.models.session_v2 import Session, SessionSegment
 from sdc.utils.session_builder import build_session
@@ -18,6 +19,16 @@ def _get_key_value(segment: SessionSegment, key: str) -> Any:
     return segment.metadata.get(key)
 
 
+def _make_key_getter(sample: SessionSegment, key: str) -> Callable[[SessionSegment], Any]:
+    """
+    Returns a getter equivalent to _get_key_value(segment, key) for segments of the
+    same model as `sample`, with the attribute-or-metadata decision made up front.
+    """
+    if hasattr(sample, key):
+        return attrgetter(key)
+    return lambda segment: segment.metadata.get(key)
+
+
 def group_segments_by_time_gap_and_keys(
     segments: List[SessionSegment],
     time_gap: datetime.timedelta,
@@ -43,30 +54,22 @@ def group_segments_by_time_gap_and_keys(
     # The function expects pre-sorted segments, but a sort here is a good safeguard.
     segments.sort(key=lambda s: s.start_time_utc)
 
+    # Label boundaries in one pass over precomputed keys: each segment's grouping-key
+    # tuple is built once (not once per neighbour), and whether a key is an attribute
+    # or a metadata entry is resolved once per key rather than once per lookup.
+    key_getters = [_make_key_getter(segments[0], key) for key in grouping_keys or []]
+    segment_keys = [tuple(get(segment) for get in key_getters) for segment in segments]
+
     sessions: List[List[SessionSegment]] = []
-    current_session_segments: List[SessionSegment] = [segments[0]]
+    session_start = 0
 
     for i in range(1, len(segments)):
-        prev_segment = segments[i - 1]
-        curr_segment = segments[i]
-
-        time_gap_exceeded = (curr_segment.start_time_utc - prev_segment.end_time_utc) > time_gap
-
-        keys_changed = False
-        if grouping_keys:
-            for key in grouping_keys:
-                if _get_key_value(curr_segment, key) != _get_key_value(prev_segment, key):
-                    keys_changed = True
-                    break
-
-        if time_gap_exceeded or keys_changed:
-            sessions.append(current_session_segments)
-            current_session_segments = [curr_segment]
-        else:
-            current_session_segments.append(curr_segment)
-
-    if current_session_segments:
-        sessions.append(current_session_segments)
+        time_gap_exceeded = (segments[i].start_time_utc - segments[i - 1].end_time_utc) > time_gap
+        if time_gap_exceeded or segment_keys[i] != segment_keys[i - 1]:
+            sessions.append(segments[session_start:i])
+            session_start = i
+
+    sessions.append(segments[session_start:])
 
     return sessions
 
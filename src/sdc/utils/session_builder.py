@@ -2,22 +2,56 @@
 """Utility for building V2 Session objects consistently."""
 
 import datetime
-import uuid
+import os
+import random
 from typing import List, Optional
 
 from sdc.models.session_v2 import (Session, SessionContext, SessionInsights,
                                    SessionMeta, SessionSegment)
 
+# Session and segment IDs only need to be unique, not unpredictable, so they are
+# drawn from a process-local PRNG seeded once from os.urandom rather than paying
+# for an os.urandom read on every uuid.uuid4() call.
+_id_rng = random.Random(os.urandom(32))
+
+def _reseed_id_rng() -> None:
+    _id_rng.seed(os.urandom(32))
+
+# Forked workers (e.g. multiprocessing pools) must not replay the parent's sequence.
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_id_rng)
+
+
+# Bit masks applied by uuid.UUID(int=..., version=4): clear the version and variant
+# fields, then set version 4 and the RFC 4122 variant.
+_UUID4_CLEAR_MASK = ~((0xf000 << 64) | (0xc000 << 48))
+_UUID4_SET_BITS = (0x4000 << 64) | (0x8000 << 48)
+
+
+def new_uuid4_str() -> str:
+    """Returns a random version-4 UUID string, equivalent in format to str(uuid.uuid4())."""
+    # Formats the hex digits directly instead of building a uuid.UUID just to str() it.
+    h = '%032x' % ((_id_rng.getrandbits(128) & _UUID4_CLEAR_MASK) | _UUID4_SET_BITS)
+    return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+
 
 def create_session_meta(
     source_system: str,
     source_identifiers: List[str],
-    processing_status: str = "Needs Linking"
+    processing_status: str = "Needs Linking",
+    ingestion_time: Optional[datetime.datetime] = None,
+    session_id: Optional[str] = None
 ) -> SessionMeta:
-    """Handles the default instantiation of SessionMeta."""
-    now = datetime.datetime.now(datetime.timezone.utc)
+    """
+    Handles the default instantiation of SessionMeta.
+
+    Pass ingestion_time to stamp every session of one ingestion run with the same
+    timestamp; otherwise the current UTC time is used. Pass session_id for a
+    deterministic ID; otherwise a random one is generated.
+    """
+    now = ingestion_time or datetime.datetime.now(datetime.timezone.utc)
     return SessionMeta(
-        session_id=str(uuid.uuid4()),
+        session_id=session_id or new_uuid4_str(),
         schema_version="2.0",
         source_system=source_system,
         source_identifiers=source_identifiers,
@@ -69,7 +103,9 @@ def build_session(
     contact_id: Optional[int] = None,
     source_title: Optional[str] = None,
     processing_status: str = "Needs Linking",
-    links: Optional[List[str]] = None
+    links: Optional[List[str]] = None,
+    ingestion_time: Optional[datetime.datetime] = None,
+    session_id: Optional[str] = None
 ) -> Session:
     """
     Orchestrates the creation of a complete Session object.
@@ -83,7 +119,7 @@ def build_session(
     start_time = min(s.start_time_utc for s in segments)
     end_time = max(s.end_time_utc for s in segments)
 
-    meta = create_session_meta(source_system, source_identifiers, processing_status)
+    meta = create_session_meta(source_system, source_identifiers, processing_status, ingestion_time, session_id)
     context = create_session_context(customer_name, contact_name, customer_id, contact_id, links)
     insights = create_session_insights(start_time, end_time, source_title)
 
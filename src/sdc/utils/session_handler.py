@@ -6,12 +6,16 @@ This is the V2 equivalent of the cuis_handler.py.
 
 import os
 import json
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import orjson
 
 # Import the new V2 Session model
 from sdc.models.session_v2 import Session
+from sdc.utils.file_utils import ensure_directory
 
-def save_session_to_file(session_object: Session, config: Dict[str, Any], logger) -> None:
+def save_session_to_file(session_object: Session, config: Dict[str, Any], logger) -> bool:
     """
     Serializes a Session Pydantic object to a JSON file with a descriptive name.
 
@@ -19,11 +23,14 @@ def save_session_to_file(session_object: Session, config: Dict[str, Any], logger
         session_object: The Session object to save.
         config: The application's configuration dictionary.
         logger: The SDC logger instance.
+
+    Returns:
+        True if the file was written, False if the error was logged instead.
     """
     try:
         # Use the new config key for the V2 output folder
         output_dir = config['project_paths']['sessions_output_folder']
-        os.makedirs(output_dir, exist_ok=True)
+        ensure_directory(output_dir)
         
         # --- Create a more descriptive filename ---
         source_system = session_object.meta.source_system
@@ -47,11 +54,37 @@ def save_session_to_file(session_object: Session, config: Dict[str, Any], logger
             f.write(session_object.model_dump_json(indent=4))
         
         logger.info(f"Successfully saved Session item {session_object.meta.session_id}")
+        return True
 
     except KeyError as e:
         logger.error(f"Configuration key error in save_session_to_file: {e}")
     except Exception as e:
         logger.error(f"An unexpected error occurred in save_session_to_file for {session_object.meta.session_id}: {e}")
+    return False
+
+def save_sessions_to_files(session_objects: List[Session], config: Dict[str, Any], logger, max_workers: int = 8) -> int:
+    """
+    Saves a batch of Session objects concurrently.
+
+    File writes release the GIL, so a small thread pool overlaps the per-file
+    open/write/close latency. Each session is saved (and any error logged) by
+    save_session_to_file, exactly as for a single save.
+
+    Args:
+        session_objects: The Session objects to save.
+        config: The application's configuration dictionary.
+        logger: The SDC logger instance.
+        max_workers: Upper bound on concurrent writer threads.
+
+    Returns:
+        The number of sessions that could not be saved.
+    """
+    if not session_objects:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(session_objects))) as executor:
+        # Drain the iterator so every save has finished before returning.
+        saved = executor.map(lambda session_object: save_session_to_file(session_object, config, logger), session_objects)
+        return sum(1 for succeeded in saved if not succeeded)
 
 def load_session_from_file(file_path: str, logger) -> Optional[Session]:
     """
@@ -66,8 +99,8 @@ def load_session_from_file(file_path: str, logger) -> Optional[Session]:
     """
     try:
         logger.debug(f"Attempting to load Session file: {file_path}")
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
         
         # Validate the data against the new Session model
         session_object = Session.model_validate(data)
@@ -8,17 +8,29 @@ class SessionDatabaseManager:
     Manages the SQLite database for session and segment data.
     """
 
-    def __init__(self, db_path: str, logger: logging.Logger):
+    def __init__(self, db_path: str, logger: logging.Logger, bulk_load: bool = False):
         """
         Initializes the SessionDatabaseManager.
 
         :param db_path: Path to the SQLite database file.
         :param logger: Logger instance.
+        :param bulk_load: Trade durability for write speed (WAL journal, NORMAL sync)
+                          until close(), which restores the default rollback journal.
         """
         self.db_path = db_path
         self.logger = logger
+        self.bulk_load = bulk_load
         self.conn = sqlite3.connect(db_path)
         self.conn.execute('PRAGMA foreign_keys = ON;')
+        if bulk_load:
+            # WAL + NORMAL sync avoid an fsync per commit during a bulk rebuild.
+            self.conn.execute('PRAGMA journal_mode = WAL;')
+            self.conn.execute('PRAGMA synchronous = NORMAL;')
+        # Connection-local tuning: the larger page cache / mmap window keep repeated
+        # reads off the disk. None of these persist in the database file.
+        self.conn.execute('PRAGMA temp_store = MEMORY;')
+        self.conn.execute('PRAGMA cache_size = -65536;')
+        self.conn.execute('PRAGMA mmap_size = 268435456;')
         self.logger.info(f"Connected to database at {db_path}")
 
     def init_schema(self):
@@ -54,18 +66,32 @@ class SessionDatabaseManager:
                         FOREIGN KEY(session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
                     )
                 """)
+                # Indexed generated column so "is this a user message" lookups are a
+                # B-tree probe instead of a LIKE scan over every metadata blob.
+                # Added via ALTER so databases created before this column exist upgrade too.
+                segment_columns = {row[1] for row in self.conn.execute("PRAGMA table_xinfo(segments)")}
+                if 'is_user' not in segment_columns:
+                    self.conn.execute("""
+                        ALTER TABLE segments ADD COLUMN is_user INTEGER
+                        GENERATED ALWAYS AS (json_extract(metadata, '$.is_user')) VIRTUAL
+                    """)
+                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_is_user ON segments(is_user)")
                 self.logger.info("Database schema initialized successfully.")
         except sqlite3.Error as e:
             self.logger.error(f"Error initializing database schema: {e}")
             raise
 
-    def upsert_session(self, session: Session):
+    def upsert_session(self, session: Session, commit: bool = True):
         """
         Inserts or updates a session and its segments in the database.
         This is an 'upsert' operation: it first deletes the existing session (and its
         cascading segments) and then inserts the new data.
 
         :param session: The Session object to upsert.
+        :param commit: If True (default), the upsert is committed immediately. If False,
+                       it is written inside a savepoint of the caller's open transaction
+                       (still atomic per session), and the caller is responsible for
+                       committing. Used for batched bulk loads.
         """
         try:
             # Pydantic v2 uses model_dump_json(), v1 uses json().
@@ -100,30 +126,20 @@ class SessionDatabaseManager:
                     json.dumps(segment.metadata)
                 ))
 
-            with self.conn:
-                # The 'with' block ensures atomicity (commit/rollback)
-                cursor = self.conn.cursor()
-
-                # Clean up existing records first
-                cursor.execute("DELETE FROM sessions WHERE session_id = ?", (session.meta.session_id,))
-
-                # Insert the main session record
-                cursor.execute("""
-                    INSERT INTO sessions (
-                        session_id, customer_name, start_time, end_time, source_system,
-                        processing_status, processing_log, links_data, generated_summaries,
-                        llm_results, full_json_backup
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, session_data)
-
-                # Bulk insert all segment records
-                if segments_data:
-                    cursor.executemany("""
-                        INSERT INTO segments (
-                            segment_id, session_id, start_time, author, type, content, metadata
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, segments_data)
-            
+            if commit:
+                with self.conn:
+                    # The 'with' block ensures atomicity (commit/rollback)
+                    self._write_session_rows(session.meta.session_id, session_data, segments_data)
+            else:
+                self.conn.execute("SAVEPOINT upsert_session")
+                try:
+                    self._write_session_rows(session.meta.session_id, session_data, segments_data)
+                except Exception:
+                    self.conn.execute("ROLLBACK TO upsert_session")
+                    raise
+                finally:
+                    self.conn.execute("RELEASE upsert_session")
+
             self.logger.info(f"Successfully upserted session_id: {session.meta.session_id} with {len(segments_data)} segments.")
 
         except sqlite3.Error as e:
@@ -133,10 +149,41 @@ class SessionDatabaseManager:
             self.logger.error(f"An unexpected error occurred during upsert for session_id {session.meta.session_id}: {e}")
             raise
 
+    def _write_session_rows(self, session_id: str, session_data: tuple, segments_data: list):
+        """
+        Executes the delete + insert statements for one session. Transaction
+        handling is left to the caller.
+        """
+        cursor = self.conn.cursor()
+
+        # Clean up existing records first
+        cursor.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+        # Insert the main session record
+        cursor.execute("""
+            INSERT INTO sessions (
+                session_id, customer_name, start_time, end_time, source_system,
+                processing_status, processing_log, links_data, generated_summaries,
+                llm_results, full_json_backup
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, session_data)
+
+        # Bulk insert all segment records
+        if segments_data:
+            cursor.executemany("""
+                INSERT INTO segments (
+                    segment_id, session_id, start_time, author, type, content, metadata
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, segments_data)
+
     def close(self):
         """
         Closes the database connection.
         """
         if self.conn:
+            if self.bulk_load:
+                # journal_mode = WAL is persistent; switch back so the file is left in
+                # the default format, without -wal/-shm sidecars, for other users.
+                self.conn.execute('PRAGMA journal_mode = DELETE;')
             self.conn.close()
             self.logger.info("Database connection closed.")
\ No newline at end of file
@@ -6,7 +6,7 @@ Manager for handling FAISS vector stores, including creation, loading, and searc
 import os
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 
 # Assuming faiss-cpu and langchain are installed.
 # FAISS is now in langchain_community
@@ -24,6 +24,8 @@ except ImportError:
         FAISS = None
         Document = None
 
+SEARCH_CACHE_SIZE = 128
+
 class VectorStoreManager:
     """Encapsulates FAISS index operations."""
 
@@ -46,6 +48,12 @@ class VectorStoreManager:
         self.storage_path = os.path.join(base_storage_path, self.index_name)
         
         self.db = None
+        # Memoizes search results per (query, k, threshold) so a repeated query does not
+        # pay for another embedding call. The cache belongs to the index it was filled
+        # from (held in _search_cache_db) and is dropped as soon as self.db is another
+        # object, however it was replaced.
+        self._search_cache: Dict[Tuple[str, int, float], Tuple[Tuple[Document, float], ...]] = {}
+        self._search_cache_db: Optional[Any] = None
         self.logger.info(f"VectorStoreManager initialized for index '{self.index_name}' at '{self.storage_path}'")
 
     def _sanitize_metadata(self, metadata_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -93,9 +101,24 @@ class VectorStoreManager:
         sanitized_metadatas = self._sanitize_metadata(metadatas)
         
         try:
-            # 2. Use FAISS.from_texts
-            self.logger.info("Generating embeddings and creating FAISS index...")
-            self.db = FAISS.from_texts(texts=texts, embedding=self.embedding_client, metadatas=sanitized_metadatas)
+            # 2. Embed each distinct text once, then fan the vectors back out so every
+            #    document (and its metadata) still gets its own entry in the index.
+            unique_positions: Dict[str, int] = {}
+            unique_texts: List[str] = []
+            for text in texts:
+                if text not in unique_positions:
+                    unique_positions[text] = len(unique_texts)
+                    unique_texts.append(text)
+            duplicate_ratio = 1 - len(unique_texts) / len(texts) if texts else 0.0
+            self.logger.info(
+                f"Generating embeddings for {len(unique_texts)} unique texts "
+                f"(duplicate ratio {duplicate_ratio:.1%}) and creating FAISS index..."
+            )
+            unique_vectors = self.embedding_client.embed_documents(unique_texts)
+            text_embeddings = [(text, unique_vectors[unique_positions[text]]) for text in texts]
+            self.db = FAISS.from_embeddings(
+                text_embeddings=text_embeddings, embedding=self.embedding_client, metadatas=sanitized_metadatas
+            )
             
             # 3. Save to disk immediately
             Path(self.storage_path).mkdir(parents=True, exist_ok=True)
@@ -159,18 +182,38 @@ class VectorStoreManager:
 
         self.logger.info(f"Performing search for query: '{query[:50]}...' with k={k}, threshold={threshold}")
         try:
-            # Use similarity_search_with_relevance_scores to get normalized scores.
-            results_with_scores = self.db.similarity_search_with_relevance_scores(query, k=k)
-            
-            # Filter results based on the threshold. A higher score is better.
-            filtered_results = [
-                (doc, score) for doc, score in results_with_scores if score >= threshold
-            ]
-            
-            self.logger.info(f"Found {len(results_with_scores)} initial results, {len(filtered_results)} after filtering.")
-            return filtered_results
-
+            return list(self._cached_search(query, k, threshold))
         except Exception as e:
             self.logger.error(f"Search failed: {e}", exc_info=True)
             return []
 
+    def _cached_search(self, query: str, k: int, threshold: float) -> Tuple[Tuple[Document, float], ...]:
+        """Serves search() from the cache when it was filled from the current self.db."""
+        if self._search_cache_db is not self.db:
+            self._search_cache.clear()
+            self._search_cache_db = self.db
+        key = (query, k, threshold)
+        cached = self._search_cache.get(key)
+        if cached is None:
+            cached = self._search_uncached(query, k, threshold)
+            if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+                # Evict the oldest entry; dicts preserve insertion order.
+                del self._search_cache[next(iter(self._search_cache))]
+            self._search_cache[key] = cached
+        return cached
+
+    def _search_uncached(self, query: str, k: int, threshold: float) -> Tuple[Tuple[Document, float], ...]:
+        """
+        Runs the FAISS search behind search(). Returns a tuple so the memoized result
+        cannot be mutated by callers; exceptions propagate so failures are not cached.
+        """
+        # Use similarity_search_with_relevance_scores to get normalized scores.
+        results_with_scores = self.db.similarity_search_with_relevance_scores(query, k=k)
+
+        # Filter results based on the threshold. A higher score is better.
+        filtered_results = tuple(
+            (doc, score) for doc, score in results_with_scores if score >= threshold
+        )
+
+        self.logger.info(f"Found {len(results_with_scores)} initial results, {len(filtered_results)} after filtering.")
+        return filtered_results
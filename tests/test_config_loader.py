@@ -29,5 +29,23 @@ class TestConfigLoader(unittest.TestCase):
         # Test getting a non-existent value without default
         self.assertIsNone(config_loader.get_config_value(self.config, "non.existent.path"))
 
+    def test_resolve_project_paths(self):
+        # Keys reference each other out of declaration order; all must resolve in one call
+        project_paths = {
+            "cache_folder": "{{data_folder}}/cache",
+            "notes_json": "{{input_folder}}/notes.json",
+            "input_folder": "{{data_folder}}/input",
+            "data_folder": "{{project_root}}/data",
+            "unknown": "{{not_a_key}}/x"
+        }
+        resolved = config_loader.resolve_project_paths("/root_dir", project_paths)
+        self.assertIs(resolved, project_paths)
+        self.assertEqual(resolved["data_folder"], os.path.normpath("/root_dir/data"))
+        self.assertEqual(resolved["input_folder"], os.path.normpath("/root_dir/data/input"))
+        self.assertEqual(resolved["cache_folder"], os.path.normpath("/root_dir/data/cache"))
+        self.assertEqual(resolved["notes_json"], os.path.normpath("/root_dir/data/input") + "/notes.json")
+        # Unknown placeholders are left untouched
+        self.assertEqual(resolved["unknown"], "{{not_a_key}}/x")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
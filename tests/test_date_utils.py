@@ -2,12 +2,24 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
+import shutil
+import tempfile
 import unittest
 from datetime import datetime, timezone, timedelta
 from sdc.utils import date_utils
 
 class TestDateUtils(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Route the sdc logger to a temporary file instead of the project's log folder.
+        cls.log_dir = tempfile.mkdtemp()
+        cls.config = {'logging': {'log_file_path': os.path.join(cls.log_dir, 'sdc.log'), 'log_to_terminal': False}}
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.log_dir, ignore_errors=True)
+
     def test_get_past_datetime_str(self):
         # Test with 180 days
         past_str = date_utils.get_past_datetime_str(180)
@@ -20,5 +32,25 @@ class TestDateUtils(unittest.TestCase):
         expected_date = datetime.now(timezone.utc) - timedelta(days=180)
         self.assertAlmostEqual(parsed_date, expected_date, delta=timedelta(seconds=5))
 
+    def test_parse_datetime_utc(self):
+        # Naive strings are assumed to be UTC; aware strings are converted to UTC.
+        self.assertEqual(date_utils.parse_datetime_utc('2024-03-01 10:00:00', self.config),
+                         datetime(2024, 3, 1, 10, 0, tzinfo=timezone.utc))
+        self.assertEqual(date_utils.parse_datetime_utc('2024-03-01T10:00:00-05:00', self.config),
+                         datetime(2024, 3, 1, 15, 0, tzinfo=timezone.utc))
+        # Non-ISO strings fall back to dateutil.
+        self.assertEqual(date_utils.parse_datetime_utc('March 1, 2024 10:00 AM', self.config),
+                         datetime(2024, 3, 1, 10, 0, tzinfo=timezone.utc))
+
+        # Repeated strings are served from the cache and still return the same value.
+        first = date_utils.parse_datetime_utc('2024-03-01T10:00:00-05:00', self.config)
+        self.assertIs(date_utils.parse_datetime_utc('2024-03-01T10:00:00-05:00', self.config), first)
+
+        # Failures fall back to the default every time, including on repeat calls.
+        fallback = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        for _ in range(2):
+            self.assertIs(date_utils.parse_datetime_utc('not a date', self.config, default_on_error=fallback), fallback)
+        self.assertIsNone(date_utils.parse_datetime_utc(None, self.config))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import unittest
+import tempfile
+import shutil
+from sdc.utils import file_ingestor_state_handler as state_handler
+
+class TestFileIngestorStateHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.test_dir, "notes.json")
+        with open(self.file_path, "w") as f:
+            f.write('{"tickets": []}')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_is_file_unchanged(self):
+        metadata = state_handler.get_file_metadata(self.file_path)
+        recorded = {**metadata, 'content_hash': state_handler.get_file_content_hash(self.file_path)}
+
+        # Same size and mtime: unchanged without hashing.
+        self.assertTrue(state_handler.is_file_unchanged(self.file_path, recorded, metadata))
+
+        # Only the mtime moved (e.g. a touch): identical bytes still count as unchanged.
+        os.utime(self.file_path, (metadata['mtime'] + 10, metadata['mtime'] + 10))
+        touched = state_handler.get_file_metadata(self.file_path)
+        self.assertTrue(state_handler.is_file_unchanged(self.file_path, recorded, touched))
+        # Without a recorded hash, an mtime change has to be treated as a change.
+        self.assertFalse(state_handler.is_file_unchanged(self.file_path, metadata, touched))
+
+        # Same size, different bytes.
+        with open(self.file_path, "w") as f:
+            f.write('{"tickets": [0]}'[:len('{"tickets": []}')])
+        self.assertFalse(state_handler.is_file_unchanged(
+            self.file_path, recorded, state_handler.get_file_metadata(self.file_path)))
+
+        # Nothing recorded yet, or the file is missing.
+        self.assertFalse(state_handler.is_file_unchanged(self.file_path, None, metadata))
+        self.assertFalse(state_handler.is_file_unchanged(self.file_path, recorded, {}))
+
+if __name__ == '__main__':
+    unittest.main()
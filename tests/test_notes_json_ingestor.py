@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import json
+import logging
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from sdc.ingestors import notes_json_ingestor
+
+class TestIngestNotes(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        tickets = [
+            {
+                'date': '12/10/24', 'ticketNumber': str(1000 + i), 'customer': f'Customer {i % 3}',
+                'contact': 'Alex Ray', 'subject': f'Ticket {i}',
+                'initial_issue': 'Slow desktop',
+                'notes': [{'order': 1, 'date': '12/11/24', 'note': f'Note {i}'}],
+                'to-do': [{'order': 1, 'date': '', 'task': f'Task {i}'}],
+            }
+            for i in range(12)
+        ]
+        # A ticket without a ticketNumber is skipped and counted as a failure.
+        tickets.append({'date': '12/10/24', 'subject': 'Missing number'})
+        todo_items = [{'date': '09/15/24', 'customer': 'Sample Corp', 'contact': 'Dr. Smith',
+                       'subject': 'Review', 'task': 'Review call logs'}]
+        self.notes_path = os.path.join(self.test_dir, 'notes.json')
+        with open(self.notes_path, 'w', encoding='utf-8') as f:
+            json.dump({'tickets': tickets, 'toDoItems': todo_items}, f)
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _config(self, run_name):
+        output_dir = os.path.join(self.test_dir, run_name)
+        return {
+            'project_paths': {
+                'notes_json': self.notes_path,
+                'cache_folder': os.path.join(output_dir, 'cache'),
+                'sessions_output_folder': os.path.join(output_dir, 'sessions'),
+            },
+            'logging': {'log_file_path': None, 'log_to_terminal': False},
+        }
+
+    def _ingest(self, run_name):
+        """Runs ingest_notes into its own output folder; returns (log lines, normalized sessions)."""
+        config = self._config(run_name)
+        with self.assertLogs(self.logger, level='INFO') as logs:
+            notes_json_ingestor.ingest_notes(config, self.logger)
+
+        sessions = []
+        for name in os.listdir(config['project_paths']['sessions_output_folder']):
+            with open(os.path.join(config['project_paths']['sessions_output_folder'], name), encoding='utf-8') as f:
+                session = json.load(f)
+            # IDs are random and the timestamps differ per run; compare everything else.
+            del session['meta']['session_id']
+            del session['meta']['ingestion_timestamp_utc']
+            del session['meta']['last_updated_timestamp_utc']
+            for segment in session['segments']:
+                del segment['segment_id']
+            sessions.append(json.dumps(session, sort_keys=True))
+        return logs.output, sorted(sessions)
+
+    def test_serial_and_pool_paths_match(self):
+        with mock.patch.object(notes_json_ingestor, 'PARALLEL_TICKET_THRESHOLD', 1000):
+            serial_logs, serial_sessions = self._ingest('serial')
+        with mock.patch.object(notes_json_ingestor, 'PARALLEL_TICKET_THRESHOLD', 4), \
+                mock.patch.object(notes_json_ingestor, 'PARALLEL_TICKET_WINDOW', 5):
+            pool_logs, pool_sessions = self._ingest('pool')
+
+        pool_message = f"INFO:{__name__}:Large notes.json detected; transforming tickets on a process pool."
+        self.assertNotIn(pool_message, serial_logs)
+        self.assertIn(pool_message, pool_logs)
+        summary = f"INFO:{__name__}:Finished NotesJSON ingestion. Total Success: 13, Total Failed: 1"
+        self.assertIn(summary, serial_logs)
+        self.assertIn(summary, pool_logs)
+        self.assertEqual(len(serial_sessions), 13)
+        self.assertEqual(pool_sessions, serial_sessions)
+
+    def test_failed_saves_count_the_same_on_both_paths(self):
+        summary = f"INFO:{__name__}:Finished NotesJSON ingestion. Total Success: 0, Total Failed: 14"
+        for run_name, threshold in (('serial', 1000), ('pool', 4)):
+            config = self._config(run_name)
+            # A file where the sessions folder should be makes every save fail.
+            os.makedirs(os.path.dirname(config['project_paths']['sessions_output_folder']))
+            open(config['project_paths']['sessions_output_folder'], 'w').close()
+            with mock.patch.object(notes_json_ingestor, 'PARALLEL_TICKET_THRESHOLD', threshold), \
+                    mock.patch.object(notes_json_ingestor, 'PARALLEL_TICKET_WINDOW', 5):
+                with self.assertLogs(self.logger, level='INFO') as logs:
+                    notes_json_ingestor.ingest_notes(config, self.logger)
+            self.assertIn(summary, logs.output, run_name)
+
+if __name__ == '__main__':
+    unittest.main()
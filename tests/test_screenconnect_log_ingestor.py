@@ -0,0 +1,168 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import datetime
+import json
+import logging
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from sdc.ingestors import screenconnect_log_ingestor
+from sdc.utils import session_handler
+
+class TestParseTimesUtc(unittest.TestCase):
+
+    def _parse(self, values):
+        return [str(value) for value in screenconnect_log_ingestor._parse_times_utc(values, {})]
+
+    def test_day_month_order_does_not_depend_on_first_row(self):
+        month_first = ['1/3/2025 17:43', '3/1/2025 09:00', '13/1/2025 10:00']
+        expected = ['2025-01-03 17:43:00+00:00', '2025-03-01 09:00:00+00:00', '2025-01-13 10:00:00+00:00']
+        self.assertEqual(self._parse(month_first), expected)
+        self.assertEqual(self._parse(month_first[::-1]), expected[::-1])
+
+    def test_returns_plain_datetimes(self):
+        parsed = screenconnect_log_ingestor._parse_times_utc(['2025-01-03 17:43:00', None], {})
+        self.assertIs(type(parsed[0]), datetime.datetime)
+        self.assertEqual(parsed[0], datetime.datetime(2025, 1, 3, 17, 43, tzinfo=datetime.timezone.utc))
+        self.assertEqual(parsed[1], screenconnect_log_ingestor.UNDEFINED_TIMESTAMP)
+
+@unittest.skipIf(screenconnect_log_ingestor.pyarrow is None, "pyarrow is not installed")
+class TestCsvReaders(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.test_dir, 'RemoteAccessLogs.csv')
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('ProcessType,SessionSessionType,SessionName,ParticipantName,ConnectedTime,'
+                    'DisconnectedTime,DurationSeconds,ConnectionID,SessionCustomProperty1\n'
+                    'Host,Access,,AdminUser,1/3/2025 17:43,1/3/2025 17:45,144,102,HealthGroup Alpha\n'
+                    'Host,Access,NA,AdminUser,1/3/2025 17:44,,,0103,HealthGroup Alpha\n'
+                    'Host,,SRV-MAIN,,1/3/2025 17:44,1/3/2025 18:37,3198,104,HealthGroup Alpha\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _segments(self, iter_columns):
+        return [
+            segment.model_dump_json()
+            for columns in iter_columns(self.csv_path)
+            for segment in screenconnect_log_ingestor._convert_columns_to_segments(columns, {})
+        ]
+
+    def test_pandas_and_arrow_readers_give_the_same_segments(self):
+        arrow_segments = self._segments(screenconnect_log_ingestor._iter_arrow_csv_columns)
+        self.assertEqual(self._segments(screenconnect_log_ingestor._iter_pandas_csv_columns), arrow_segments)
+        # The row without a ParticipantName is dropped by both.
+        self.assertEqual(len(arrow_segments), 2)
+        first, second = (json.loads(segment) for segment in arrow_segments)
+        self.assertEqual(first['metadata']['connection_id'], '102')
+        self.assertEqual(first['content'], 'Connected to machine: None')
+        self.assertEqual(second['metadata']['connection_id'], '0103')
+        self.assertEqual(second['content'], 'Connected to machine: NA')
+        self.assertIsNone(second['metadata']['duration_seconds'])
+
+class _Crash(BaseException):
+    """Stands in for the process dying; the ingestor's per-group handler does not catch it."""
+
+class TestIngestScreenConnectResume(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        log_dir = os.path.join(self.test_dir, 'logs')
+        os.makedirs(log_dir)
+        self.csv_path = os.path.join(log_dir, 'RemoteAccessLogs.csv')
+        rows = ['ProcessType,SessionSessionType,SessionName,ParticipantName,ConnectedTime,'
+                'DisconnectedTime,DurationSeconds,ConnectionID,SessionCustomProperty1']
+        # Two hours apart, so each connection becomes its own session.
+        for i in range(6):
+            rows.append(f'Host,Access,WKSTN-0{i},AdminUser,1/3/2025 {8 + 2 * i}:00,1/3/2025 {8 + 2 * i}:30,'
+                        f'1800,connection-{i},HealthGroup Alpha')
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(rows) + '\n')
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _config(self, run_name):
+        output_dir = os.path.join(self.test_dir, run_name)
+        return {
+            'project_paths': {
+                'screenconnect_logs': os.path.dirname(self.csv_path),
+                'cache_folder': os.path.join(output_dir, 'cache'),
+                'sessions_output_folder': os.path.join(output_dir, 'sessions'),
+            },
+            'logging': {'log_file_path': None, 'log_to_terminal': False},
+        }
+
+    def _ingest(self, config):
+        with self.assertLogs(self.logger, level='INFO') as logs:
+            screenconnect_log_ingestor.ingest_screenconnect(config, self.logger)
+        return logs.output
+
+    def _file_state(self, config):
+        state_path = os.path.join(config['project_paths']['cache_folder'], screenconnect_log_ingestor.STATE_FILE_NAME)
+        if not os.path.exists(state_path):
+            return None
+        with open(state_path, encoding='utf-8') as f:
+            return json.load(f).get(self.csv_path)
+
+    def _session_files(self, config):
+        return sorted(os.listdir(config['project_paths']['sessions_output_folder']))
+
+    @mock.patch.object(screenconnect_log_ingestor, 'SAVE_BATCH_SIZE', 2)
+    def test_resume_after_crash_mid_batch_does_not_duplicate_sessions(self):
+        calls = []
+        def crash_on_second_batch(sessions, config, logger):
+            calls.append(len(sessions))
+            if len(calls) == 2:
+                # Part of the batch reaches disk before the crash.
+                session_handler.save_sessions_to_files(sessions[:1], config, logger)
+                raise _Crash()
+            return session_handler.save_sessions_to_files(sessions, config, logger)
+
+        config = self._config('resumed')
+        with mock.patch.object(screenconnect_log_ingestor, 'save_sessions_to_files', crash_on_second_batch):
+            with self.assertRaises(_Crash):
+                self._ingest(config)
+        self.assertEqual(self._file_state(config)['sessions_saved'], 2)
+        crashed_files = self._session_files(config)
+        self.assertEqual(len(crashed_files), 3)
+
+        logs = self._ingest(config)
+        self.assertIn(f"INFO:{__name__}:Resuming '{self.csv_path}': skipping 2 sessions saved by an interrupted run.", logs)
+        # The session saved just before the crash is overwritten, not written again under a new ID.
+        resumed_files = self._session_files(config)
+        self.assertEqual(len(resumed_files), 6)
+        self.assertTrue(set(crashed_files) <= set(resumed_files))
+        file_state = self._file_state(config)
+        self.assertNotIn('sessions_saved', file_state)
+        self.assertIn('content_hash', file_state)
+
+    def test_fresh_ingest_does_not_overwrite_earlier_sessions(self):
+        config = self._config('repeated')
+        self._ingest(config)
+        first_files = self._session_files(config)
+        # Forget the file so the same export is ingested again from scratch.
+        os.remove(os.path.join(config['project_paths']['cache_folder'], screenconnect_log_ingestor.STATE_FILE_NAME))
+        self._ingest(config)
+        all_files = self._session_files(config)
+        self.assertEqual(len(first_files), 6)
+        self.assertEqual(len(all_files), 12)
+
+    @mock.patch.object(screenconnect_log_ingestor, 'SAVE_BATCH_SIZE', 2)
+    def test_failed_saves_block_checkpoint_and_state(self):
+        config = self._config('failing')
+        # Every write fails: the saver logs each error and reports the whole batch as failed.
+        with mock.patch.object(screenconnect_log_ingestor, 'save_sessions_to_files',
+                               side_effect=lambda sessions, config, logger: len(sessions)):
+            logs = self._ingest(config)
+        self.assertIn(f"INFO:{__name__}:Finished ScreenConnect ingestion. Total Success: 0, Total Failed: 6", logs)
+        self.assertIsNone(self._file_state(config))
+
+if __name__ == '__main__':
+    unittest.main()
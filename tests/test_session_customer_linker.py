@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import logging
+import unittest
+
+# The linker imports the LLM clients, which need the optional langchain providers.
+try:
+    from sdc.processors import session_customer_linker as linker
+except ImportError:
+    linker = None
+
+@unittest.skipIf(linker is None, "LLM client dependencies are not installed")
+class TestFindBestMatch(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger(__name__)
+
+    def _match(self, guessed_name, names, threshold):
+        config = {'processing_defaults': {'customer_linking_fuzzy_match_threshold': threshold}}
+        candidates = [{'business_name': name} for name in names]
+        winner = linker._find_best_match(guessed_name, candidates, 'business_name', 'company', config, self.logger)
+        return winner['business_name'] if winner else None
+
+    def test_scores_are_rounded_like_thefuzz(self):
+        # Raw token_set_ratio is 59.57: it rounds to 60, so it clears the 60-point floor.
+        self.assertEqual(self._match('Health Pediatric Dental', ['Partners Services Dental'], 59),
+                         'Partners Services Dental')
+        # Raw 84.6 rounds to 85 and meets a threshold of 85.
+        self.assertEqual(self._match('Acme Corporation', ['Corporation Inc'], 85), 'Corporation Inc')
+        # Well below the floor nothing is linked.
+        self.assertIsNone(self._match('Harbor Health', ['Summit Tech'], 60))
+
+    def test_latin1_characters_are_dropped_like_thefuzz(self):
+        self.assertEqual(linker._normalize_name('Café Bistro'), 'caf bistro')
+        self.assertEqual(self._match('Caf Bistro', ['Café Bistro'], 90), 'Café Bistro')
+
+    def test_exact_match_ignores_case(self):
+        self.assertEqual(self._match('acme corp', ['Acme Corp', 'Acme Corporation'], 90), 'Acme Corp')
+
+if __name__ == '__main__':
+    unittest.main()